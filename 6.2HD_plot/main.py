@@ -2,9 +2,19 @@ import dash
 from dash import dcc, html, dash_table
 from dash.dependencies import Input, Output, State
 import plotly.graph_objs as go
+from plotly.utils import PlotlyJSONEncoder
 import pandas as pd
+import numpy as np
 import threading
 import time
+import json
+import os
+import sys
+
+# Make the shared sensorkit package importable when run from this folder
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from sensorkit import spectral, query_client, metrics
+from sensorkit.cache import LRUCache
 
 # Initialize the Dash app
 app = dash.Dash(__name__)
@@ -13,6 +23,37 @@ global_df = None
 current_index = 0
 batch_size = 100  
 
+# When set, rows are fetched from the sensorkit query service one window at a
+# time instead of loading the whole CSV into this process
+query_url = None
+data_length = 0
+
+# Bumped whenever the data changes (file rewritten or appended, or a new
+# version reported by the query service); part of every figure cache key
+data_file = None
+data_mtime = None
+data_version = 0
+
+# Rough size of a cached (figure, summary) pair; the trace arrays dominate
+def figure_nbytes(entry):
+    figure, summary = entry
+    size = 1024 + 100 * len(summary)
+    for trace in figure['data']:
+        for attr in ('x', 'y', 'z'):
+            if attr in trace and trace[attr] is not None:
+                size += np.asarray(trace[attr]).nbytes
+    return size
+
+# Computed figures and summary rows of recently viewed windows, so paging
+# back and forth or switching graph types is a lookup instead of a rebuild
+FIGURE_CACHE_BYTES = 64 * 1024 * 1024
+figure_cache = LRUCache(max_bytes=FIGURE_CACHE_BYTES, sizeof=figure_nbytes)
+
+metrics.describe('dash_callback_seconds', 'Time spent in Dash callbacks')
+metrics.describe('dash_figure_payload_bytes', 'Serialised size of the figure returned by update_graph')
+metrics.describe('dash_figure_cache_total', 'update_graph figure cache lookups by result')
+metrics.describe('dash_simulate_update_lag_seconds', 'How late the simulated update thread woke up')
+
 # Load the entire data once
 def load_data(file_path):
     df = pd.read_csv(file_path)
@@ -28,27 +69,61 @@ def load_data(file_path):
 
     return df
 
+# Rows [start, start + count) of the data, from memory or the query service
+def get_window(start, count):
+    global data_length
+
+    if query_url is None:
+        return global_df.iloc[start:start + count]
+
+    df = query_client.fetch_frame('gyroscope', url=query_url, offset=start, limit=count)
+    data_length = df.attrs['total']
+    set_data_version(df.attrs['version'])
+    return df
+
+def set_data_version(version):
+    global data_version
+
+    if version != data_version:
+        data_version = version
+        figure_cache.clear()  # entries for the old data can never be hit again
+
+# Pick up rows appended to the CSV (or a new service version) since the last check
+def refresh_data():
+    global global_df, data_length, data_mtime
+
+    if query_url is not None:
+        get_window(0, 0)
+        return
+
+    mtime = os.path.getmtime(data_file)
+    if mtime != data_mtime:
+        global_df = load_data(data_file)
+        data_length = len(global_df)
+        data_mtime = mtime
+        set_data_version(data_version + 1)
+
 # Function to simulate the data update every 10 seconds
 def simulate_data_update():
     global global_df, current_index
     
     while True:
+        started = time.perf_counter()
         time.sleep(10)  # Simulate new data every 10 seconds
+
+        # How late the thread woke up, e.g. while callbacks hold the GIL
+        lag = time.perf_counter() - started - 10
+        metrics.observe('dash_simulate_update_lag_seconds', lag)
         
         # Increment the current index to simulate incoming data
         current_index += batch_size
         
-        if current_index >= len(global_df):
+        if current_index >= data_length:
             current_index = 0  # Restart from the beginning if we reach the end
         
+        refresh_data()
         print(f"Data updated. Showing rows: {current_index} to {current_index + batch_size}")
 
-# Start the background thread for simulating data updates
-threading.Thread(target=simulate_data_update, daemon=True).start()
-
-# Load the entire data
-global_df = load_data('gyroscope_data.csv')
-
 # Define the layout of the app
 app.layout = html.Div([
     html.Div([
@@ -62,7 +137,8 @@ app.layout = html.Div([
             options=[
                 {'label': 'Scatter Plot', 'value': 'scatter'},
                 {'label': 'Line Chart', 'value': 'line'},
-                {'label': 'Distribution Plot', 'value': 'distribution'}
+                {'label': 'Distribution Plot', 'value': 'distribution'},
+                {'label': 'Spectrogram', 'value': 'spectrogram'}
             ],
             value='line',
             style={'width': '200px'}
@@ -109,6 +185,28 @@ app.layout = html.Div([
     )
 ], style={'backgroundColor': '#FFF0F5', 'minHeight': '100vh', 'padding': '20px'})
 
+# Heatmap trace of the power spectrum of one axis over sliding windows
+def spectrogram_traces(df_subset, axis):
+    if len(df_subset) < 8:
+        return []
+
+    # The logger does not sample on an exact grid, so resample first
+    fs = spectral.estimate_rate(df_subset['timestamp'].values)
+    grid, values = spectral.resample_uniform(df_subset['timestamp'].values, df_subset[axis].values, fs)
+    window = min(64, max(8, len(values) // 4))
+    freqs, times, power = spectral.spectrogram(values, fs, window=window, hop=max(1, window // 4))
+
+    start = df_subset['timestamp'].iloc[0]
+    return [
+        go.Heatmap(
+            x=start + pd.to_timedelta(times, unit='s'),
+            y=freqs,
+            z=10 * np.log10(power.T + 1e-12),
+            colorscale='Viridis',
+            colorbar=dict(title='dB/Hz')
+        )
+    ]
+
 # Callback to update the graph and table
 @app.callback(
     [Output('main-graph', 'figure'),
@@ -122,6 +220,7 @@ app.layout = html.Div([
      Input('interval-component', 'n_intervals')],
     [State('main-graph', 'figure')]
 )
+@metrics.timed('dash_callback_seconds', callback='update_graph')
 def update_graph(graph_type, x_axis, y_axis, num_samples, prev_clicks, next_clicks, n_intervals, current_fig):
     global global_df, current_index
     
@@ -137,9 +236,20 @@ def update_graph(graph_type, x_axis, y_axis, num_samples, prev_clicks, next_clic
     elif button_id == 'prev-button':
         current_index = max(0, current_index - num_samples)
     
-    # Slice the dataframe to get the current batch of data
-    end_index = min(len(global_df), current_index + num_samples)
-    df_subset = global_df.iloc[current_index:end_index]
+    key = (graph_type, x_axis, y_axis, current_index, num_samples, data_version)
+    cached = figure_cache.get(key)
+    if cached is not None:
+        metrics.inc('dash_figure_cache_total', result='hit')
+        return cached
+    metrics.inc('dash_figure_cache_total', result='miss')
+
+    # Slice the dataframe to get the current batch of data. The version is
+    # taken first: if refresh_data swaps the data meanwhile, the figure is
+    # filed under the old version (never looked up again), not the new one
+    version = data_version
+    df_subset = get_window(current_index, num_samples)
+    if query_url is not None:
+        version = df_subset.attrs['version']  # what the service actually answered from
     
     # Color mapping for x, y, z
     color_map = {'x': 'red', 'y': 'green', 'z': 'blue'}
@@ -164,6 +274,8 @@ def update_graph(graph_type, x_axis, y_axis, num_samples, prev_clicks, next_clic
                 line=dict(color=color_map[col])
             ) for col in ['x', 'y', 'z'] if col in df_subset.columns
         ]
+    elif graph_type == 'spectrogram':
+        traces = spectrogram_traces(df_subset, y_axis)
     else:  # distribution
         traces = [
             go.Histogram(
@@ -173,11 +285,18 @@ def update_graph(graph_type, x_axis, y_axis, num_samples, prev_clicks, next_clic
             ) for col in ['x', 'y', 'z'] if col in df_subset.columns
         ]
     
-    layout = go.Layout(
-        title=f'{graph_type.capitalize()} Plot of Gyroscope Data',
-        xaxis={'title': x_axis},
-        yaxis={'title': 'Value'}
-    )
+    if graph_type == 'spectrogram':
+        layout = go.Layout(
+            title=f'Spectrogram of Gyroscope {y_axis.upper()}',
+            xaxis={'title': 'timestamp'},
+            yaxis={'title': 'Frequency (Hz)'}
+        )
+    else:
+        layout = go.Layout(
+            title=f'{graph_type.capitalize()} Plot of Gyroscope Data',
+            xaxis={'title': x_axis},
+            yaxis={'title': 'Value'}
+        )
     
     figure = {'data': traces, 'layout': layout}
     
@@ -191,9 +310,38 @@ def update_graph(graph_type, x_axis, y_axis, num_samples, prev_clicks, next_clic
         {'statistic': f'{col.upper()} Std Dev', 'value': f"{df_subset[col].std():.2f}"}
         for col in ['x', 'y', 'z'] if col in df_subset.columns
     ]
-    
+
+    if metrics.enabled():
+        # Serialising again costs about as much as Dash's own encoding, so only when collecting
+        payload = json.dumps(figure, cls=PlotlyJSONEncoder)
+        metrics.observe('dash_figure_payload_bytes', len(payload), buckets=metrics.SIZE_BUCKETS,
+                        graph_type=graph_type)
+
+    figure_cache.put(key[:-1] + (version,), (figure, summary_data))
     return figure, summary_data
 
+# Load the data, start the simulated updates and run the app.
+# Kept out of module level so importing this file has no side effects.
+def main(file_path='gyroscope_data.csv', debug=True, port=5000, service_url=None):
+    global query_url, data_file
+
+    if service_url:
+        # Only the rendered window is fetched; refresh_data just learns the row count
+        query_url = service_url
+    else:
+        # Load the entire data, reloaded by refresh_data when the file changes
+        data_file = file_path
+    refresh_data()
+
+    # Start the background thread for simulating data updates
+    threading.Thread(target=simulate_data_update, daemon=True).start()
+
+    # With debug on, the reloader runs the app in a child process; serve metrics from that one
+    if not debug or os.environ.get('WERKZEUG_RUN_MAIN') == 'true':
+        metrics.serve_from_env()
+
+    app.run(debug=debug, port=port)
+
 # Run the app
 if __name__ == '__main__':
-    app.run_server(debug=True, port = 5000)
+    main()
@@ -2,12 +2,20 @@ import pandas as pd
 import numpy as np
 from bokeh.plotting import figure
 from bokeh.layouts import column, row
-from bokeh.models import ColumnDataSource, Select, TextInput, Button, DataTable, TableColumn, HoverTool, Range1d
+from bokeh.models import ColumnDataSource, Select, TextInput, Button, DataTable, TableColumn, HoverTool, Range1d, Legend, LegendItem
 from bokeh.server.server import Server
 from bokeh.application import Application
 from bokeh.application.handlers.function import FunctionHandler
 from datetime import datetime, timedelta
 from collections import deque
+import os
+import sys
+
+# Make the shared sensorkit package importable when run from this folder
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from sensorkit import metrics
+
+metrics.describe('bokeh_callback_seconds', 'Time spent in Bokeh callbacks')
 
 class GyroscopeDataHandler:
   def __init__(self, window_size=100):
@@ -45,12 +53,24 @@ class GyroscopeDataHandler:
       return pd.DataFrame(list(self.data_window))
 
 class GyroscopeDashboard:
+  HIST_BINS = 20
+
   def __init__(self, data_handler):
       self.data_handler = data_handler
       self.source = ColumnDataSource(data=dict(timestamp=[], x=[], y=[], z=[]))
       self.colors = {'x': 'red', 'y': 'green', 'z': 'blue'}
       self.plot = None
 
+      # Histograms live in their own fixed-size sources so they can be patched
+      empty = np.zeros(self.HIST_BINS)
+      self.hist_sources = {
+          axis: ColumnDataSource(data=dict(top=empty.copy(), left=empty.copy(), right=empty.copy()))
+          for axis in self.colors
+      }
+      self.renderers = {}
+      self.legend_items = {}
+      self.legend = None
+
   def create_plot(self):
       self.plot = figure(
           title="Gyroscope Data Visualization",
@@ -72,6 +92,23 @@ class GyroscopeDashboard:
           formatters={'@timestamp': 'datetime'}
       )
       self.plot.add_tools(hover)
+
+      # Create every glyph once; update_plot only switches visibility
+      for axis, color in self.colors.items():
+          self.renderers[('Line', axis)] = self.plot.line(
+              'timestamp', axis, source=self.source, color=color)
+          self.renderers[('Scatter', axis)] = self.plot.scatter(
+              'timestamp', axis, source=self.source, color=color, size=5)
+          self.renderers[('Distribution', axis)] = self.plot.quad(
+              top='top', bottom=0, left='left', right='right', source=self.hist_sources[axis],
+              fill_color=color, line_color="white", alpha=0.5)
+
+      # One legend entry per glyph, so clicking "X" only hides what is shown;
+      # set_visible swaps in the entries of the current graph type
+      for key, renderer in self.renderers.items():
+          self.legend_items[key] = LegendItem(label=key[1].upper(), renderers=[renderer])
+      self.legend = Legend(items=[], click_policy="hide")
+      self.plot.add_layout(self.legend)
       return self.plot
 
   def create_widgets(self):
@@ -89,32 +126,50 @@ class GyroscopeDashboard:
       return DataTable(source=table_source, columns=columns, width=400, height=200), table_source
 
   def update_plot(self, graph_type, y_select, samples):
+      # Full refresh, only needed when a widget changes
       df = self.data_handler.get_current_data().tail(samples)
-      new_data = {
-          'timestamp': df['timestamp'],
-          'x': df['x'],
-          'y': df['y'],
-          'z': df['z']
+      self.source.data = {
+          'timestamp': df['timestamp'].values,
+          'x': df['x'].values,
+          'y': df['y'].values,
+          'z': df['z'].values
       }
-      self.source.data = new_data
-
-      self.plot.renderers = []  # Clear existing renderers
-
-      if graph_type in ['Line', 'Scatter']:
-          axes = ['x', 'y', 'z'] if y_select == 'all' else [y_select]
-          for axis in axes:
-              if graph_type == 'Line':
-                  self.plot.line('timestamp', axis, source=self.source, color=self.colors[axis], legend_label=axis.upper())
-              else:  # Scatter
-                  self.plot.scatter('timestamp', axis, source=self.source, color=self.colors[axis], legend_label=axis.upper(), size=5)
-      elif graph_type == 'Distribution':
-          axes = ['x', 'y', 'z'] if y_select == 'all' else [y_select]
-          for axis in axes:
-              hist, edges = np.histogram(df[axis], bins=20, density=True)
-              self.plot.quad(top=hist, bottom=0, left=edges[:-1], right=edges[1:], 
-                             fill_color=self.colors[axis], line_color="white", alpha=0.5, legend_label=axis.upper())
-
-      self.plot.legend.click_policy = "hide"
+      self.set_visible(graph_type, y_select)
+      if graph_type == 'Distribution':
+          self.patch_histograms(y_select)
+
+  def stream_data(self, new_df, graph_type, y_select, samples):
+      # Periodic update: send only the new rows and let the browser drop
+      # the ones that fall out of the window. The handler keeps at most
+      # data_window.maxlen rows, which is all update_plot can ever show.
+      rollover = min(samples, self.data_handler.data_window.maxlen)
+      self.source.stream({
+          'timestamp': new_df['timestamp'].values,
+          'x': new_df['x'].values,
+          'y': new_df['y'].values,
+          'z': new_df['z'].values
+      }, rollover=rollover)
+      if graph_type == 'Distribution':
+          self.patch_histograms(y_select)
+
+  def set_visible(self, graph_type, y_select):
+      shown = []
+      for (kind, axis), renderer in self.renderers.items():
+          renderer.visible = kind == graph_type and y_select in ('all', axis)
+          if renderer.visible:
+              shown.append(self.legend_items[(kind, axis)])
+      self.legend.items = shown
+
+  def patch_histograms(self, y_select):
+      axes = ['x', 'y', 'z'] if y_select == 'all' else [y_select]
+      bins = slice(0, self.HIST_BINS)
+      for axis in axes:
+          hist, edges = np.histogram(self.source.data[axis], bins=self.HIST_BINS, density=True)
+          self.hist_sources[axis].patch({
+              'top': [(bins, hist)],
+              'left': [(bins, edges[:-1])],
+              'right': [(bins, edges[1:])]
+          })
 
   def update_table(self, table_source):
       df = self.data_handler.get_current_data()
@@ -135,11 +190,13 @@ def gyroscope_dashboard(doc):
   graph_type, y_select, samples_input = dashboard.create_widgets()
   data_table, table_source = dashboard.create_table()
 
+  @metrics.timed('bokeh_callback_seconds', callback='update')
   def update():
       new_data = data_handler.fetch_new_data()
-      dashboard.update_plot(graph_type.value, y_select.value, int(samples_input.value))
+      dashboard.stream_data(new_data, graph_type.value, y_select.value, int(samples_input.value))
       dashboard.update_table(table_source)
 
+  @metrics.timed('bokeh_callback_seconds', callback='update_on_change')
   def update_on_change(attr, old, new):
       dashboard.update_plot(graph_type.value, y_select.value, int(samples_input.value))
 
@@ -150,21 +207,27 @@ def gyroscope_dashboard(doc):
   doc.title = "Gyroscope Data Dashboard"
 
   # Initial update
-  update()
+  dashboard.update_plot(graph_type.value, y_select.value, int(samples_input.value))
+  dashboard.update_table(table_source)
 
   # Add callbacks for widget changes
   graph_type.on_change('value', update_on_change)
   y_select.on_change('value', update_on_change)
   samples_input.on_change('value', update_on_change)
 
-# Create Bokeh application
-app = Application(FunctionHandler(gyroscope_dashboard))
+def main(port=5006, show=True):
+  # Create Bokeh application
+  app = Application(FunctionHandler(gyroscope_dashboard))
 
-# Launch the server
-server = Server({'/': app}, num_procs=1)
-server.start()
+  # Launch the server here rather than at import time
+  server = Server({'/': app}, num_procs=1, port=port)
+  server.start()
+  metrics.serve_from_env()
 
-if __name__ == '__main__':
-  print('Opening Bokeh application on http://localhost:5006/')
-  server.io_loop.add_callback(server.show, "/")
+  print(f'Opening Bokeh application on http://localhost:{port}/')
+  if show:
+      server.io_loop.add_callback(server.show, "/")
   server.io_loop.start()
+
+if __name__ == '__main__':
+  main()
@@ -2,43 +2,78 @@ import streamlit as st
 import pandas as pd
 import numpy as np
 import plotly.graph_objects as go
-from abc import ABC, abstractmethod
 from collections import deque
-from datetime import datetime, timedelta
+from datetime import datetime
 import time
+import os
+import sys
 
-# Abstract base class for data sources (Adapter pattern)
-class DataSource(ABC):
-  @abstractmethod
-  def get_data(self, last_timestamp):
-      pass
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+# Make the shared sensorkit package importable when run from this folder
+sys.path.insert(0, os.path.join(HERE, '..'))
+from sensorkit.sources import Batch, DataSource, CsvReplaySource
+from sensorkit import metrics
+
+metrics.describe('streamlit_fragment_seconds', 'Time spent rendering Streamlit fragments')
 
 # Concrete implementation for simulated data
 class SimulatedDataSource(DataSource):
-  def get_data(self, last_timestamp):
-      new_data = {
-          'timestamp': [last_timestamp + timedelta(seconds=i) for i in range(1, 11)],
-          'x': np.random.randn(10),
-          'y': np.random.randn(10),
-          'z': np.random.randn(10)
-      }
-      return pd.DataFrame(new_data)
+  def __init__(self, **kwargs):
+      super().__init__(**kwargs)
+      self.last_timestamp = np.datetime64(datetime.now(), 'ns')
+
+  def read_batch(self, max_samples):
+      n = min(10, max_samples)
+      timestamps = self.last_timestamp + np.arange(1, n + 1) * np.timedelta64(1, 's')
+      self.last_timestamp = timestamps[-1]
+      return self._delivered(Batch(timestamps.astype(np.int64), np.random.randn(n, 3), self.columns))
+
+# Sources selectable from the sidebar
+SOURCES = {
+  'Simulated': lambda: SimulatedDataSource(),
+  'CSV Replay': lambda: CsvReplaySource(os.path.join(HERE, 'gyroscope_data.csv'), loop=True, overflow='drop_oldest'),
+}
 
 # Data handler class
 class DataHandler:
-  def __init__(self, data_source: DataSource, window_size=100):
+  def __init__(self, data_source: DataSource, window_size=100, batch_size=1000):
       self.data_source = data_source
+      self.batch_size = batch_size
       self.data_window = deque(maxlen=window_size)
       self.last_update = datetime.now()
+      self.last_fetch = None
+
+      # Bumped on every update so derived results can be cached per window
+      self.version = 0
+      self._frame = None
+      self._frame_version = -1
 
   def update_data(self):
-      new_data = self.data_source.get_data(self.last_update)
-      for _, row in new_data.iterrows():
-          self.data_window.append(row)
+      # Pull whatever the source has ready as one array batch
+      batch = self.data_source.read_batch(self.batch_size)
+      if not len(batch):
+          return
+      new_data = batch.to_frame()
+      self.data_window.extend(new_data.to_dict('records'))
       self.last_update = new_data['timestamp'].iloc[-1]
+      self.version += 1
+
+  def refresh_if_due(self, interval):
+      # Widget changes rerun the page too; only pull new data on schedule.
+      # Fragment ticks can fire a little early, so allow some slack.
+      now = time.monotonic()
+      if self.last_fetch is None or now - self.last_fetch >= interval * 0.9:
+          self.update_data()
+          self.last_fetch = now
+          return True
+      return False
 
   def get_current_data(self):
-      return pd.DataFrame(list(self.data_window))
+      if self._frame_version != self.version:
+          self._frame = pd.DataFrame(list(self.data_window))
+          self._frame_version = self.version
+      return self._frame
 
 # Dashboard class
 class Dashboard:
@@ -46,6 +81,26 @@ class Dashboard:
       self.data_handler = data_handler
       self.fig = go.Figure()
 
+      # Figures and summaries for the current data version only
+      self._cache = {}
+      self._cache_version = None
+
+  def _cached(self, key, compute):
+      if self._cache_version != self.data_handler.version:
+          self._cache.clear()
+          self._cache_version = self.data_handler.version
+      if key not in self._cache:
+          self._cache[key] = compute()
+      return self._cache[key]
+
+  def get_figure(self, graph_type, y_axis, num_samples):
+      return self._cached(('figure', graph_type, y_axis, num_samples),
+                          lambda: self.update_plot(graph_type, y_axis, num_samples))
+
+  def get_summary(self, num_samples):
+      return self._cached(('summary', num_samples),
+                          lambda: self.compute_summary(self.data_handler.get_current_data().tail(num_samples)))
+
   def update_plot(self, graph_type, y_axis, num_samples):
       df = self.data_handler.get_current_data().tail(num_samples)
       
@@ -98,42 +153,45 @@ class Dashboard:
       return pd.DataFrame(summary)
 
 # Streamlit app
+REFRESH_SECONDS = 10
+
+# st.fragment reruns just the decorated function on a timer, without
+# blocking the script run or keeping a loop alive per session
+fragment = getattr(st, 'fragment', None) or st.experimental_fragment
+
+@fragment(run_every=REFRESH_SECONDS)
+@metrics.timed('streamlit_fragment_seconds', fragment='live_view')
+def live_view(graph_type, y_axis, num_samples):
+  dashboard = st.session_state.dashboard
+  dashboard.data_handler.refresh_if_due(REFRESH_SECONDS)
+
+  # Update plot
+  st.plotly_chart(dashboard.get_figure(graph_type, y_axis, num_samples), use_container_width=True)
+
+  # Update summary statistics
+  st.dataframe(dashboard.get_summary(num_samples))
+
 def main():
   st.set_page_config(page_title="Gyroscope Data Dashboard", layout="wide")
   st.title('Gyroscope Data Dashboard')
+  metrics.serve_from_env()  # once per process; later reruns are no-ops
+
+  # Sidebar controls
+  st.sidebar.header("Controls")
+  source_name = st.sidebar.selectbox('Data Source', list(SOURCES))
 
   # Initialize session state
-  if 'dashboard' not in st.session_state:
-      data_source = SimulatedDataSource()
+  if st.session_state.get('source_name') != source_name:
+      data_source = SOURCES[source_name]()
       data_handler = DataHandler(data_source)
       st.session_state.dashboard = Dashboard(data_handler)
+      st.session_state.source_name = source_name
 
-  # Sidebar controls
-  st.sidebar.header("Controls")
   graph_type = st.sidebar.selectbox('Select Graph Type', ['Line', 'Scatter', 'Distribution'])
   y_axis = st.sidebar.selectbox('Select Y-axis', ['x', 'y', 'z', 'all'])
   num_samples = st.sidebar.number_input('Number of Samples', min_value=10, value=100, step=10)
 
-  # Create placeholders for dynamic content
-  plot_placeholder = st.empty()
-  summary_placeholder = st.empty()
-
-  # Main loop for continuous updates
-  while True:
-      # Update data
-      st.session_state.dashboard.data_handler.update_data()
-
-      # Update plot
-      fig = st.session_state.dashboard.update_plot(graph_type, y_axis, num_samples)
-      plot_placeholder.plotly_chart(fig, use_container_width=True)
-
-      # Update summary statistics
-      df = st.session_state.dashboard.data_handler.get_current_data().tail(num_samples)
-      summary_df = st.session_state.dashboard.compute_summary(df)
-      summary_placeholder.dataframe(summary_df)
-
-
-      time.sleep(10)
+  live_view(graph_type, y_axis, num_samples)
 
 if __name__ == "__main__":
   main()
@@ -2,15 +2,18 @@ import pandas as pd
 import dash
 from dash import dcc, html
 import plotly.graph_objects as go
-import pandas as pd
 
 file_path_csv = 'serial_monitor_export.csv'
-df_csv = pd.read_csv(file_path_csv, sep=";", engine='python')
 
-# Clean the data
-df_csv['Value'] = df_csv['Value'].str.replace(r'\r\n', '', regex=True)
-distance_data = df_csv[df_csv['Value'].str.contains('cm')]
-distance_data['Distance (cm)'] = distance_data['Value'].str.extract('(\d+)').astype(float)
+# Read the serial monitor export and keep only the distance readings
+def load_distance_data(file_path):
+    df_csv = pd.read_csv(file_path, sep=";", engine='python')
+
+    # Clean the data
+    df_csv['Value'] = df_csv['Value'].str.replace(r'\r\n', '', regex=True)
+    distance_data = df_csv[df_csv['Value'].str.contains('cm')].copy()
+    distance_data['Distance (cm)'] = distance_data['Value'].str.extract(r'(\d+)').astype(float)
+    return distance_data
 
 # Define color function
 def get_color(x):
@@ -25,39 +28,45 @@ def get_color(x):
     else:
         return 'darkred'
 
-# Apply color function to create a list of colors
-colors = [get_color(x) for x in distance_data['Distance (cm)']]
-
-# Initialize Dash app
-app = dash.Dash(__name__)
-
-# Create Dash layout
-app.layout = html.Div([
-    html.H1("Distance Measurements Dashboard"),
-    dcc.Graph(
-        id='distance-bar-chart',
-        figure={
-            'data': [
-                go.Bar(
-                    x=distance_data.index,
-                    y=distance_data['Distance (cm)'],
-                    marker_color=colors,  # Use the color list here
-                    hovertemplate='<b>Index:</b> %{x}<br><b>Distance:</b> %{y} cm',
+def create_app(distance_data):
+    # Apply color function to create a list of colors
+    colors = [get_color(x) for x in distance_data['Distance (cm)']]
+
+    # Initialize Dash app
+    app = dash.Dash(__name__)
+
+    # Create Dash layout
+    app.layout = html.Div([
+        html.H1("Distance Measurements Dashboard"),
+        dcc.Graph(
+            id='distance-bar-chart',
+            figure={
+                'data': [
+                    go.Bar(
+                        x=distance_data.index,
+                        y=distance_data['Distance (cm)'],
+                        marker_color=colors,  # Use the color list here
+                        hovertemplate='<b>Index:</b> %{x}<br><b>Distance:</b> %{y} cm',
+                    )
+                ],
+                'layout': go.Layout(
+                    title='Distance Measurements Over Time',
+                    xaxis=dict(title='Index (Time Points)'),
+                    yaxis=dict(title='Distance (cm)', range=[0, max(distance_data['Distance (cm)']) + 10]),
+                    plot_bgcolor='white',
+                    paper_bgcolor='white',
+                    font=dict(color='black'),
+                    height=600
                 )
-            ],
-            'layout': go.Layout(
-                title='Distance Measurements Over Time',
-                xaxis=dict(title='Index (Time Points)'),
-                yaxis=dict(title='Distance (cm)', range=[0, max(distance_data['Distance (cm)']) + 10]),
-                plot_bgcolor='white',
-                paper_bgcolor='white',
-                font=dict(color='black'),
-                height=600
-            )
-        }
-    )
-])
+            }
+        )
+    ])
+    return app
+
+def main(file_path=file_path_csv, debug=True, port=8050):
+    app = create_app(load_distance_data(file_path))
+    app.run(debug=debug, port=port)
 
 # Run the Dash app
 if __name__ == '__main__':
-    app.run_server(debug=True)
\ No newline at end of file
+    main()
@@ -0,0 +1,4 @@
+"""
+    Benchmarks for the sensor tooling. Run from the repository root, e.g.
+        python -m benchmarks.bench_codec
+"""
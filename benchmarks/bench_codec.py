@@ -0,0 +1,106 @@
+"""
+    Compare the sensorkit archive codec against plain CSV and gzip-CSV on
+    the data files recorded in this repository.
+
+    For every file and format we report the stored size and the encode and
+    decode throughput in rows per second. "Decode" always means getting back
+    integer timestamps and float values, so CSV pays for parsing text.
+
+    Usage:
+        python -m benchmarks.bench_codec [--repeat N] [--json results.json]
+"""
+
+import argparse
+import gzip
+import io
+import json
+import os
+import time
+
+from sensorkit import codec
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+DATA_FILES = [
+    '6.2HD_plot/gyroscope_data.csv',
+    '5.2D/clean_gyroscope_data_20240905_000838.csv',
+    'week-3/dht22.csv',
+    'week-2/ultrasonic_data.csv',
+    'week-8/Python_Accelerometer_Combined.csv',
+    'week-8/historic-data-20240902T145008Z/iPhone Thing-Accelerometer_X.csv',
+]
+
+
+def best_of(repeat, func):
+    """Run func repeat times and return (best seconds, last result)."""
+    best = float('inf')
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def csv_encode(timestamps, columns, meta):
+    buf = io.StringIO()
+    codec.write_csv(buf, timestamps, columns, meta)
+    return buf.getvalue().encode('utf-8')
+
+
+def csv_decode(data):
+    return codec.read_csv(io.StringIO(data.decode('utf-8')))[:2]
+
+
+def bench_file(path, repeat):
+    timestamps, columns, scales, meta = codec.read_csv(path)
+    rows = len(timestamps)
+    meta = dict(meta, columns=list(columns), scales=[scales[name] for name in columns])
+
+    formats = {
+        'csv': (lambda: csv_encode(timestamps, columns, meta), csv_decode),
+        'csv.gz': (lambda: gzip.compress(csv_encode(timestamps, columns, meta)),
+                   lambda data: csv_decode(gzip.decompress(data))),
+        'skc': (lambda: codec.encode(timestamps, columns, scales, meta=meta), codec.decode),
+    }
+
+    results = {}
+    for name, (encode, decode) in formats.items():
+        enc_time, data = best_of(repeat, encode)
+        dec_time, decoded = best_of(repeat, lambda: decode(data))
+        if decoded[0] != timestamps:
+            raise AssertionError(f"{name} round trip changed the timestamps of {path}")
+        results[name] = {
+            'bytes': len(data),
+            'encode_rows_per_s': rows / enc_time,
+            'decode_rows_per_s': rows / dec_time,
+        }
+    return {'rows': rows, 'source_bytes': os.path.getsize(path), 'formats': results}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--json', help='also write the results to this file')
+    args = parser.parse_args()
+
+    report = {}
+    print(f"{'file':<48} {'format':<7} {'bytes':>9} {'ratio':>6} {'enc rows/s':>11} {'dec rows/s':>11}")
+    for rel in DATA_FILES:
+        path = os.path.join(ROOT, rel)
+        if not os.path.exists(path):
+            continue
+        result = report[rel] = bench_file(path, args.repeat)
+        for name, r in result['formats'].items():
+            ratio = result['source_bytes'] / r['bytes']
+            print(f"{rel[-48:]:<48} {name:<7} {r['bytes']:>9} {ratio:>5.1f}x "
+                  f"{r['encode_rows_per_s']:>11,.0f} {r['decode_rows_per_s']:>11,.0f}")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"Results written to {args.json}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,89 @@
+"""
+    Cold start time of the sensorkit command line.
+
+    Each command is run in a fresh interpreter a few times and the best wall
+    time is reported. Besides --help, the logger scripts `ingest` runs are
+    loaded exactly as the command does (everything short of opening the
+    serial port). We also check that the lightweight commands do not drag
+    in any of the heavy plotting/analysis packages, and fail when a command
+    goes over its time budget so a stray top-level import gets noticed.
+
+    Usage:
+        python -m benchmarks.bench_startup [--repeat N] [--budget-ms MS]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+HEAVY_MODULES = ['pandas', 'numpy', 'plotly', 'dash', 'bokeh', 'streamlit', 'scipy', 'sklearn', 'matplotlib']
+
+COMMANDS = {
+    'python (baseline)': [sys.executable, '-c', 'pass'],
+    'sensorkit --help': [sys.executable, '-m', 'sensorkit', '--help'],
+    'ingest --help': [sys.executable, '-m', 'sensorkit', 'ingest', '--help'],
+    'export --help': [sys.executable, '-m', 'sensorkit', 'export', '--help'],
+}
+# Load the script behind `ingest <sensor>` the way cmd_ingest does
+for _sensor in ('dht22', 'ultrasonic'):
+    COMMANDS[f'ingest {_sensor} (load)'] = [
+        sys.executable, '-c',
+        f"from sensorkit import cli; cli.load_script(cli.SCRIPTS[{_sensor!r}], chdir=False)"]
+
+# Parse an ingest command line, load both logger scripts and list the heavy
+# modules that got imported
+IMPORT_CHECK = (
+    "import sys\n"
+    "from sensorkit import cli\n"
+    "cli.build_parser().parse_args(['ingest', 'dht22', '--port', 'x'])\n"
+    "cli.load_script(cli.SCRIPTS['dht22'], chdir=False)\n"
+    "cli.load_script(cli.SCRIPTS['ultrasonic'], chdir=False)\n"
+    "from sensorkit import codec\n"
+    "print(','.join(m for m in %r if m in sys.modules))\n" % HEAVY_MODULES
+)
+
+
+def time_command(command, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run(command, cwd=ROOT, stdout=subprocess.DEVNULL, check=True)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--budget-ms', type=float, default=150.0,
+                        help='allowed time over the bare interpreter start')
+    parser.add_argument('--json', help='also write the results to this file')
+    args = parser.parse_args()
+
+    results = {name: time_command(command, args.repeat) for name, command in COMMANDS.items()}
+    baseline = results['python (baseline)']
+    for name, ms in results.items():
+        print(f"{name:<26} {ms:8.1f} ms  (+{ms - baseline:.1f})")
+
+    heavy = subprocess.run([sys.executable, '-c', IMPORT_CHECK], cwd=ROOT,
+                           capture_output=True, text=True, check=True).stdout.strip()
+    print(f"heavy modules imported by ingest/export: {heavy or 'none'}")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({'startup_ms': results, 'heavy_modules': heavy.split(',') if heavy else []}, f, indent=2)
+
+    slow = [name for name, ms in results.items() if ms - baseline > args.budget_ms]
+    if heavy or slow:
+        print(f"FAIL: over budget: {slow}, heavy imports: {heavy or 'none'}")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
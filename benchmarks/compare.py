@@ -0,0 +1,53 @@
+"""
+    Compare two benchmark JSON files written by benchmarks.suite.
+
+    Cases are matched on (case, size) and the best times compared. Anything
+    slower than --threshold (default 1.2 = 20 % slower) is reported as a
+    regression and makes the script exit with status 1.
+
+    Usage:
+        python -m benchmarks.compare baseline.json results.json [--threshold 1.2]
+"""
+
+import argparse
+import json
+import sys
+
+
+def load(path):
+    with open(path) as f:
+        data = json.load(f)
+    return {(r['case'], r['size']): r for r in data['results']}, data.get('environment', {})
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('baseline')
+    parser.add_argument('current')
+    parser.add_argument('--threshold', type=float, default=1.2)
+    args = parser.parse_args()
+
+    old, old_env = load(args.baseline)
+    new, new_env = load(args.current)
+    print(f"baseline {(old_env.get('commit') or '?')[:10]}  vs  current {(new_env.get('commit') or '?')[:10]}")
+
+    regressions = 0
+    for key in sorted(old.keys() & new.keys()):
+        ratio = new[key]['best_s'] / old[key]['best_s']
+        flag = ''
+        if ratio > args.threshold:
+            flag = '  REGRESSION'
+            regressions += 1
+        elif ratio < 1 / args.threshold:
+            flag = '  faster'
+        print(f"{key[0]:<40} {key[1]:>10,} {old[key]['best_s'] * 1000:>10.2f} -> "
+              f"{new[key]['best_s'] * 1000:>10.2f} ms  x{ratio:.2f}{flag}")
+
+    for key in sorted(old.keys() - new.keys()):
+        print(f"{key[0]:<40} {key[1]:>10,}  missing from current run")
+
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,87 @@
+"""
+    Seeded synthetic data shaped like the recordings in this repository,
+    so benchmark runs are reproducible at any size from 10^3 to 10^7 rows.
+"""
+
+import numpy as np
+import pandas as pd
+
+SEED = 225
+START = pd.Timestamp('2024-08-11 16:13:03')
+
+
+def _rng(seed):
+    return np.random.default_rng(SEED if seed is None else seed)
+
+
+def gyroscope_frame(n, seed=None):
+    """Gyroscope rows like 6.2HD_plot/gyroscope_data.csv: ~0.3-0.8 s apart, 2 decimals."""
+    rng = _rng(seed)
+    steps = rng.uniform(0.25, 0.85, n).cumsum()
+    walk = np.cumsum(rng.normal(0, 0.05, (n, 3)), axis=0) + rng.normal(0, 0.02, (n, 3))
+    return pd.DataFrame({
+        'timestamp': START + pd.to_timedelta(steps, unit='s'),
+        'x': walk[:, 0].round(2),
+        'y': walk[:, 1].round(2),
+        'z': walk[:, 2].round(2),
+    })
+
+
+def write_gyroscope_csv(path, n, seed=None):
+    # Same layout as the logger output: nanosecond timestamps
+    gyroscope_frame(n, seed).to_csv(path, index=False, date_format='%Y-%m-%d %H:%M:%S.%f000')
+    return path
+
+
+def write_influx_export(path, n, seed=None):
+    """InfluxDB annotated CSV like 5.2D/influxdata_*.csv, rows out of time order."""
+    df = gyroscope_frame(n, seed)
+    df = df.iloc[_rng(seed).permutation(n)]
+    with open(path, 'w') as f:
+        f.write('#group,false,false,false,false\n#datatype,dateTime:RFC3339,double,double,double\n#default,,,,\n')
+        f.write(',time,x,y,z\n')
+        for t, x, y, z in zip(df['timestamp'].dt.strftime('%Y-%m-%dT%H:%M:%S.%fZ'), df['x'], df['y'], df['z']):
+            f.write(f",{t},{x},{y},{z}\n")
+    return path
+
+
+def dht22_frame(n, seed=None):
+    """DHT22 rows like week-7/dht22_data.csv: 2 s apart, 1 decimal, a few humidity spikes."""
+    rng = _rng(seed)
+    temperature = (23 + np.cumsum(rng.normal(0, 0.02, n))).round(1)
+    humidity = (53 - 0.8 * (temperature - 23) + rng.normal(0, 0.3, n)).round(1)
+    spikes = rng.random(n) < 0.02
+    humidity[spikes] += rng.uniform(5, 20, spikes.sum()).round(1)
+    return pd.DataFrame({
+        'Timestamp': START + pd.to_timedelta(np.arange(n) * 2, unit='s'),
+        'Humidity (%)': humidity,
+        'Temperature (°C)': temperature,
+    })
+
+
+def dht22_serial_lines(n, seed=None, invalid_every=20):
+    """Lines as printed by the DHT22 sketch, read by week-3/main.py:parse_data."""
+    df = dht22_frame(n, seed)
+    lines = [f"Humidity: {h:.2f}%\tTemperature: {t:.2f}*C"
+             for h, t in zip(df['Humidity (%)'].tolist(), df['Temperature (°C)'].tolist())]
+    if invalid_every:
+        for i in range(0, n, invalid_every):
+            lines[i] = 'Failed to read from DHT sensor!'
+    return lines
+
+
+def write_serial_monitor_export(path, n, seed=None):
+    """Arduino IDE serial monitor export like 9.2HD/serial_monitor_export.csv."""
+    rng = _rng(seed)
+    distances = rng.integers(0, 120, n)
+    with open(path, 'w') as f:
+        f.write('Timestamp;Value;Type\n')
+        for i, d in enumerate(distances.tolist()):
+            stamp = f"3:{58 + i // 60000 % 2}:{i // 1000 % 60:02d} PM.{i % 1000:03d}"
+            if i % 4 == 0:
+                f.write(f"{stamp};Distance: \\r\\n;received\n")
+            elif i % 4 == 3:
+                f.write(f"{stamp};LED1 (Green 1): {'ON' if d > 40 else 'OFF'}\\r\\n;received\n")
+            else:
+                f.write(f"{stamp};{d} cm\\r\\n;received\n")
+    return path
@@ -0,0 +1,276 @@
+"""
+    Performance benchmark suite for ingestion, loading, plotting and analysis.
+
+    Every case runs the real function from the task scripts on seeded
+    synthetic data (benchmarks/generators.py) at each requested size and
+    records the best and median wall time over a few repeats. Results are
+    written as JSON so two runs can be compared with benchmarks/compare.py.
+
+    Cases:
+        parse_data        week-3/main.py:parse_data over serial lines
+        load_data         6.2HD_plot/main.py:load_data on a gyroscope CSV
+        update_graph      6.2HD_plot/main.py:update_graph latency (uncached and cached)
+                          and payload size
+        data_handler      6.2HD_plot/main2.py:DataHandler.update_data / get_current_data
+        analyze_data      week-7/main.py:analyze_data (regression + plot)
+        export_parsing    9.2HD/viz.py:load_distance_data on a serial monitor export
+        codec             sensorkit.codec encode / decode
+        cleaning          sensorkit.cleaning on an unsorted InfluxDB export, to .skc
+
+    Usage:
+        python -m benchmarks.suite --out results.json
+        python -m benchmarks.suite --sizes 1e3,1e4,1e5,1e6,1e7 --cases load_data,codec
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+from benchmarks import generators
+from sensorkit.cli import ROOT, load_script
+
+DEFAULT_SIZES = [10**3, 10**4, 10**5]
+
+# Largest size each case runs at unless --no-limit is given; plotting ten
+# million points with matplotlib or building a Plotly figure that big says
+# nothing useful and takes minutes.
+SIZE_LIMITS = {
+    'update_graph': 10**6,
+    'analyze_data': 10**6,
+    'data_handler': 10**6,
+}
+
+
+def measure(func, repeat, setup=None):
+    """Run func repeat times (after setup() each time); return (timings, last result)."""
+    timings = []
+    result = None
+    for _ in range(repeat):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        result = func()
+        timings.append(time.perf_counter() - start)
+    return timings, result
+
+
+def record(case, size, timings, items=None, **extra):
+    best = min(timings)
+    entry = {
+        'case': case,
+        'size': size,
+        'repeat': len(timings),
+        'best_s': best,
+        'median_s': statistics.median(timings),
+    }
+    if items:
+        entry['items_per_s'] = items / best
+    entry.update(extra)
+    return entry
+
+
+@contextlib.contextmanager
+def quiet():
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        yield
+
+
+# --- cases -------------------------------------------------------------------
+
+def bench_parse_data(size, repeat, tmp):
+    module = load_script('week-3/main.py', chdir=False)
+    lines = generators.dht22_serial_lines(size)
+    timings, parsed = measure(lambda: [module.parse_data(line) for line in lines], repeat)
+    dropped = sum(p is None for p in parsed)
+    return [record('parse_data', size, timings, items=size, dropped_lines=dropped)]
+
+
+def bench_load_data(size, repeat, tmp):
+    module = load_script('6.2HD_plot/main.py', chdir=False)
+    path = generators.write_gyroscope_csv(os.path.join(tmp, f'gyro_{size}.csv'), size)
+    timings, df = measure(lambda: module.load_data(path), repeat)
+    return [record('load_data', size, timings, items=size, file_bytes=os.path.getsize(path))]
+
+
+def bench_update_graph(size, repeat, tmp):
+    import dash
+    from unittest import mock
+    from plotly.utils import PlotlyJSONEncoder
+
+    module = load_script('6.2HD_plot/main.py', chdir=False)
+    module.global_df = generators.gyroscope_frame(size)
+    module.data_length = size
+    module.query_url = None
+
+    class NoTrigger:
+        triggered = []
+
+    results = []
+    with mock.patch.object(dash, 'callback_context', NoTrigger):
+        for graph_type in ('line', 'scatter', 'distribution', 'spectrogram'):
+            def reset():
+                module.current_index = 0
+                module.figure_cache.clear()
+
+            def call():
+                return module.update_graph(graph_type, 'timestamp', 'x', size, 0, 0, 0, None)
+
+            timings, (figure, summary) = measure(call, repeat, setup=reset)
+            payload = len(json.dumps({'figure': figure, 'summary': summary}, cls=PlotlyJSONEncoder))
+            results.append(record(f'update_graph[{graph_type}]', size, timings, payload_bytes=payload))
+
+            timings, _ = measure(call, repeat)
+            results.append(record(f'update_graph[{graph_type},cached]', size, timings))
+    return results
+
+
+def bench_data_handler(size, repeat, tmp):
+    from sensorkit.sources import ReplaySource
+
+    module = load_script('6.2HD_plot/main2.py', chdir=False)
+    frame = generators.gyroscope_frame(size)
+    timestamps = frame['timestamp'].values.astype('datetime64[ns]').astype('int64')
+    values = frame[['x', 'y', 'z']].to_numpy()
+
+    handlers = []
+
+    def setup():
+        source = ReplaySource(timestamps, values, ('x', 'y', 'z'), speed=None, maxsize=size)
+        handlers[:] = [module.DataHandler(source, window_size=size, batch_size=size)]
+
+    update_timings, _ = measure(lambda: handlers[0].update_data(), repeat, setup=setup)
+    current_timings, _ = measure(lambda: handlers[0].get_current_data(), repeat,
+                                 setup=lambda: setattr(handlers[0], 'version', handlers[0].version + 1))
+    cached_timings, _ = measure(lambda: handlers[0].get_current_data(), repeat)
+    return [
+        record('data_handler.update_data', size, update_timings, items=size),
+        record('data_handler.get_current_data', size, current_timings, items=size),
+        record('data_handler.get_current_data[cached]', size, cached_timings),
+    ]
+
+
+def bench_analyze_data(size, repeat, tmp):
+    import matplotlib
+    matplotlib.use('Agg')
+
+    module = load_script('week-7/main.py', chdir=False)
+    module.output_dir = tmp
+    df = generators.dht22_frame(size)
+    with quiet():
+        timings, _ = measure(lambda: module.analyze_data(df, 'Benchmark', 'bench.png', degree=2), repeat)
+    return [record('analyze_data', size, timings, items=size)]
+
+
+def bench_export_parsing(size, repeat, tmp):
+    module = load_script('9.2HD/viz.py', chdir=False)
+    path = generators.write_serial_monitor_export(os.path.join(tmp, f'export_{size}.csv'), size)
+    timings, df = measure(lambda: module.load_distance_data(path), repeat)
+    return [record('export_parsing', size, timings, items=size, distance_rows=len(df))]
+
+
+def bench_codec(size, repeat, tmp):
+    from sensorkit import codec
+
+    frame = generators.gyroscope_frame(size)
+    timestamps = frame['timestamp'].values.astype('datetime64[ns]').astype('int64').tolist()
+    columns = {c: frame[c].tolist() for c in ('x', 'y', 'z')}
+    scales = {c: 2 for c in columns}
+    enc_timings, data = measure(lambda: codec.encode(timestamps, columns, scales), repeat)
+    dec_timings, _ = measure(lambda: codec.decode(data), repeat)
+    return [
+        record('codec.encode', size, enc_timings, items=size, encoded_bytes=len(data)),
+        record('codec.decode', size, dec_timings, items=size),
+    ]
+
+
+def bench_cleaning(size, repeat, tmp):
+    from sensorkit import cleaning
+
+    path = generators.write_influx_export(os.path.join(tmp, f'influx_{size}.csv'), size)
+    out = os.path.join(tmp, 'clean.skc')
+    # Small chunks so even the smaller sizes go through several runs and the merge
+    chunk = max(os.path.getsize(path) // 8, 4096)
+    timings, stats = measure(lambda: cleaning.clean_exports([path], out, chunk_bytes=chunk), repeat)
+    return [record('cleaning', size, timings, items=size, runs=stats['runs'],
+                   output_bytes=os.path.getsize(out))]
+
+
+CASES = {
+    'parse_data': bench_parse_data,
+    'load_data': bench_load_data,
+    'update_graph': bench_update_graph,
+    'data_handler': bench_data_handler,
+    'analyze_data': bench_analyze_data,
+    'export_parsing': bench_export_parsing,
+    'codec': bench_codec,
+    'cleaning': bench_cleaning,
+}
+
+
+def environment():
+    import numpy
+    import pandas
+
+    try:
+        commit = subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=ROOT, capture_output=True,
+                                text=True).stdout.strip() or None
+    except OSError:
+        commit = None
+    return {
+        'created': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'commit': commit,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'processor': platform.processor(),
+        'numpy': numpy.__version__,
+        'pandas': pandas.__version__,
+        'seed': generators.SEED,
+    }
+
+
+def parse_sizes(text):
+    return [int(float(s)) for s in text.split(',') if s]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--cases', default=','.join(CASES), help='comma separated subset of cases')
+    parser.add_argument('--sizes', type=parse_sizes, default=DEFAULT_SIZES,
+                        help='comma separated row counts, e.g. 1e3,1e4,1e5')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--no-limit', action='store_true', help='ignore the per-case size limits')
+    parser.add_argument('--out', default='benchmark_results.json')
+    args = parser.parse_args()
+
+    cwd = os.getcwd()
+    out = os.path.abspath(args.out)
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for case in args.cases.split(','):
+            if case not in CASES:
+                parser.error(f"unknown case {case!r}")
+            for size in args.sizes:
+                if not args.no_limit and size > SIZE_LIMITS.get(case, float('inf')):
+                    continue
+                for entry in CASES[case](size, args.repeat, tmp):
+                    results.append(entry)
+                    rate = f"{entry['items_per_s']:>14,.0f}/s" if 'items_per_s' in entry else ' ' * 16
+                    print(f"{entry['case']:<40} {size:>10,} {entry['best_s'] * 1000:>10.2f} ms {rate}")
+                    sys.stdout.flush()
+                os.chdir(cwd)
+
+    with open(out, 'w') as f:
+        json.dump({'environment': environment(), 'results': results}, f, indent=2)
+    print(f"Results written to {out}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,6 @@
+"""
+    Shared helpers for the sensor scripts in this repository.
+
+    The weekly task folders stay runnable on their own; anything that is
+    used by more than one of them lives here.
+"""
@@ -0,0 +1,62 @@
+"""
+    Thread-safe LRU cache bounded by entry count and/or an estimated size
+    in bytes, with hit/miss/eviction counters.
+
+    Used by the query service for encoded responses and by the 6.2HD Dash
+    app for computed figures, whose keys carry a data version so entries
+    for superseded data are never returned.
+"""
+
+import threading
+from collections import OrderedDict
+
+
+class LRUCache:
+    def __init__(self, max_items=None, max_bytes=None, sizeof=len):
+        self.max_items = max_items
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.nbytes = 0
+        self._items = OrderedDict()  # key -> (value, size)
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._items)
+
+    def get(self, key):
+        with self._lock:
+            item = self._items.get(key)
+            if item is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._items.move_to_end(key)
+            return item[0]
+
+    def put(self, key, value):
+        size = self.sizeof(value) if self.max_bytes is not None else 0
+        with self._lock:
+            old = self._items.pop(key, None)
+            if old is not None:
+                self.nbytes -= old[1]
+            if self.max_bytes is not None and size > self.max_bytes:
+                return  # would evict everything else and still not fit
+            self._items[key] = (value, size)
+            self.nbytes += size
+            while ((self.max_items is not None and len(self._items) > self.max_items)
+                   or (self.max_bytes is not None and self.nbytes > self.max_bytes)):
+                _, (_, evicted) = self._items.popitem(last=False)
+                self.nbytes -= evicted
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+            self.nbytes = 0
+
+    def stats(self):
+        return {'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions,
+                'entries': len(self._items), 'bytes': self.nbytes}
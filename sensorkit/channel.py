@@ -0,0 +1,317 @@
+"""
+    Pipelined request/response channel over a serial port.
+
+    The week-1 scripts write one number, block on readline() and sleep, so
+    only one command is ever on the wire. Here every request carries a
+    sequence number ("<seq> <payload>\\n") and the board answers with the
+    same number ("<seq> <reply>\\n", see week-1/sketch_serial_channel.ino).
+    Up to `window` requests are in flight at once; a reader thread matches
+    replies to the waiting futures, resends requests that time out and keeps
+    live round-trip time percentiles.
+
+    EchoDevice is a pty based stand-in for the board so the channel can be
+    exercised without hardware.
+
+    Usage:
+        python -m sensorkit.channel --port /dev/tty.usbmodem1301 --bench 1000
+        python -m sensorkit.channel --echo --bench 1000 --window 16
+"""
+
+import argparse
+import itertools
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+
+
+def _resolve(future, result=None, error=None):
+    """Complete future unless the caller already cancelled it."""
+    if not future.set_running_or_notify_cancel():
+        return
+    if error is not None:
+        future.set_exception(error)
+    else:
+        future.set_result(result)
+
+
+class LatencyStats:
+    """Round-trip times of the most recent `size` replies, in seconds."""
+
+    def __init__(self, size=1000):
+        self.samples = deque(maxlen=size)
+        self.count = 0
+        self.timeouts = 0
+        self.retries = 0
+        self._lock = threading.Lock()
+
+    def add(self, rtt):
+        with self._lock:
+            self.samples.append(rtt)
+            self.count += 1
+
+    def percentiles(self, points=(50, 90, 99)):
+        with self._lock:
+            ordered = sorted(self.samples)
+        if not ordered:
+            return {p: None for p in points}
+        last = len(ordered) - 1
+        return {p: ordered[min(last, int(round(p / 100 * last)))] for p in points}
+
+    def summary(self):
+        pct = self.percentiles()
+        parts = [f"p{p}={v * 1000:.1f}ms" if v is not None else f"p{p}=-" for p, v in pct.items()]
+        return f"{self.count} replies, {self.retries} retries, {self.timeouts} timeouts, " + ' '.join(parts)
+
+
+class _Pending:
+    __slots__ = ('future', 'line', 'sent', 'deadline', 'attempts')
+
+    def __init__(self, future, line):
+        self.future = future
+        self.line = line
+        self.sent = 0.0
+        self.deadline = 0.0
+        self.attempts = 0
+
+
+class SerialChannel:
+    """
+    Sequence-numbered command channel with several commands in flight.
+
+    `ser` is anything with write() and a readline() that returns b'' on
+    timeout (a pyserial Serial opened with a short timeout). request()
+    returns a concurrent.futures.Future; call() waits for the reply.
+    """
+
+    def __init__(self, ser, window=8, timeout=1.0, retries=2):
+        self.ser = ser
+        self.window = window
+        self.timeout = timeout
+        self.retries = retries
+        self.stats = LatencyStats()
+
+        self._seq = itertools.count(1)
+        self._slots = threading.BoundedSemaphore(window)
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._running = True
+        self._reader = threading.Thread(target=self._read_loop, daemon=True)
+        self._reader.start()
+
+    @classmethod
+    def open(cls, port, baud_rate=9600, **kwargs):
+        import serial
+
+        return cls(serial.Serial(port, baud_rate, timeout=0.05), **kwargs)
+
+    def request(self, payload):
+        """
+        Send payload and return a Future for the reply; blocks while the
+        window is full. Raises ConnectionError once the channel is closed.
+        """
+        if not self._running:
+            raise ConnectionError("Channel closed")
+        self._slots.acquire()
+        seq = next(self._seq) % 1000000
+        future = Future()
+        entry = _Pending(future, f"{seq} {payload}\n".encode('utf-8'))
+        with self._lock:
+            # The reader may have died while we waited for a slot
+            if not self._running:
+                self._slots.release()
+                raise ConnectionError("Channel closed")
+            self._pending[seq] = entry
+        try:
+            self._send(entry)
+        except OSError as e:
+            with self._lock:
+                self._finish(seq)
+            raise ConnectionError(f"Write failed: {e}") from e
+        return future
+
+    def call(self, payload):
+        """Send payload and wait for the reply."""
+        return self.request(payload).result()
+
+    def close(self):
+        self._running = False
+        self._reader.join(timeout=1.0)
+        self._fail_pending(ConnectionError("Channel closed"))
+        self.ser.close()
+
+    def _fail_pending(self, error):
+        """Stop accepting requests and fail every request still in flight."""
+        with self._lock:
+            self._running = False
+            pending, self._pending = self._pending, {}
+            for _ in pending:
+                self._slots.release()
+        for entry in pending.values():
+            _resolve(entry.future, error=error)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _send(self, entry):
+        entry.attempts += 1
+        entry.sent = time.perf_counter()
+        entry.deadline = entry.sent + self.timeout
+        with self._write_lock:
+            self.ser.write(entry.line)
+
+    def _finish(self, seq):
+        entry = self._pending.pop(seq, None)
+        if entry is not None:
+            self._slots.release()
+        return entry
+
+    def _read_loop(self):
+        error = ConnectionError("Channel closed")
+        try:
+            while self._running:
+                line = self.ser.readline()
+                now = time.perf_counter()
+                if line:
+                    seq, _, reply = line.decode('utf-8', 'replace').strip().partition(' ')
+                    if seq.isdigit():
+                        with self._lock:
+                            entry = self._finish(int(seq))
+                        if entry is not None:
+                            # A reply to a resent command may answer either attempt,
+                            # so only first attempts give a trustworthy RTT
+                            if entry.attempts == 1:
+                                self.stats.add(now - entry.sent)
+                            _resolve(entry.future, reply)
+                self._check_timeouts(now)
+        except (OSError, TypeError) as e:
+            # Port unplugged or closed underneath us
+            error = ConnectionError(f"Serial port lost: {e}")
+        finally:
+            self._fail_pending(error)
+
+    def _check_timeouts(self, now):
+        with self._lock:
+            expired = [(seq, e) for seq, e in self._pending.items() if e.deadline <= now]
+        for seq, entry in expired:
+            if entry.attempts <= self.retries:
+                self.stats.retries += 1
+                self._send(entry)
+                continue
+            with self._lock:
+                entry = self._finish(seq)
+            if entry is not None:
+                self.stats.timeouts += 1
+                _resolve(entry.future, error=TimeoutError(f"No reply to request {seq}"))
+
+
+class EchoDevice:
+    """
+    Stand-in for the Arduino on a pseudo terminal.
+
+    Replies to "<seq> <n>" with "<seq> <n + 1>" like sketch_serial_channel.ino,
+    after `delay` seconds. `port` is the path to open with pyserial.
+    """
+
+    def __init__(self, delay=0.0, drop_every=0):
+        self.delay = delay
+        self.drop_every = drop_every
+        self._master, slave = os.openpty()
+        self.port = os.ttyname(slave)
+        self._slave = slave
+        self._running = True
+        self._thread = threading.Thread(target=self._serve, daemon=True)
+        self._thread.start()
+
+    def _serve(self):
+        buf = b''
+        received = 0
+        while self._running:
+            try:
+                chunk = os.read(self._master, 4096)
+            except OSError:
+                break
+            buf += chunk
+            *lines, buf = buf.split(b'\n')
+            for line in lines:
+                received += 1
+                if self.drop_every and received % self.drop_every == 0:
+                    continue
+                seq, _, payload = line.decode('utf-8').strip().partition(' ')
+                reply = str(int(payload) + 1) if payload.lstrip('-').isdigit() else payload
+                if self.delay:
+                    time.sleep(self.delay)
+                try:
+                    os.write(self._master, f"{seq} {reply}\n".encode('utf-8'))
+                except OSError:
+                    return  # closed while replying
+
+    def close(self):
+        self._running = False
+        os.close(self._slave)
+        os.close(self._master)
+
+
+def benchmark(channel, count=1000, report_every=0):
+    """Push `count` requests through the channel as fast as the window allows."""
+    futures = deque()
+    failures = 0
+    start = time.perf_counter()
+    for i in range(count):
+        futures.append(channel.request(i))
+        # Collect finished replies as we go so memory stays flat
+        while futures and futures[0].done():
+            failures += futures.popleft().exception() is not None
+        if report_every and (i + 1) % report_every == 0:
+            print(f"[{i + 1}/{count}] {channel.stats.summary()}")
+    for future in futures:
+        try:
+            future.result()
+        except (TimeoutError, ConnectionError):
+            failures += 1
+    elapsed = time.perf_counter() - start
+    return {
+        'requests': count,
+        'failures': failures,
+        'seconds': elapsed,
+        'commands_per_s': count / elapsed,
+        'rtt_percentiles_ms': {p: v * 1000 if v is not None else None
+                               for p, v in channel.stats.percentiles().items()},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Pipelined serial command channel')
+    parser.add_argument('--port', help='serial port of the Arduino')
+    parser.add_argument('--baud', type=int, default=9600)
+    parser.add_argument('--echo', action='store_true', help='use a pty echo stand-in instead of a board')
+    parser.add_argument('--delay', type=float, default=0.0, help='reply delay of the echo stand-in (s)')
+    parser.add_argument('--window', type=int, default=8, help='requests in flight at once')
+    parser.add_argument('--timeout', type=float, default=1.0)
+    parser.add_argument('--retries', type=int, default=2)
+    parser.add_argument('--bench', type=int, default=100, help='number of requests to send')
+    args = parser.parse_args()
+
+    device = EchoDevice(delay=args.delay) if args.echo else None
+    port = device.port if device else args.port
+    if not port:
+        parser.error('either --port or --echo is required')
+
+    with SerialChannel.open(port, args.baud, window=args.window,
+                            timeout=args.timeout, retries=args.retries) as channel:
+        result = benchmark(channel, args.bench, report_every=max(args.bench // 10, 1))
+    if device:
+        device.close()
+
+    print(f"{result['requests']} requests in {result['seconds']:.2f}s "
+          f"({result['commands_per_s']:.0f} commands/s, {result['failures']} failed)")
+    print('RTT ' + ' '.join(f"p{p}={v:.2f}ms" for p, v in result['rtt_percentiles_ms'].items() if v is not None))
+
+
+if __name__ == '__main__':
+    main()
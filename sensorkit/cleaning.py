@@ -0,0 +1,347 @@
+"""
+    Out-of-core cleaning of the 5.2D database exports.
+
+    The notebooks in 5.2D read a whole export, coerce x/y/z column by column
+    (falling back to one element at a time), parse timestamps row by row with
+    .apply, sort and write a new CSV. This does the same in bounded memory:
+
+      1. every input is split into byte ranges that end on a line break;
+      2. worker processes parse their range with pandas, coerce the value
+         columns with pd.to_numeric and the timestamps with one vectorised
+         pd.to_datetime, drop invalid rows, sort, and write a sorted run
+         (.npy, memory mapped later);
+      3. the runs are merged block by block (an external k-way merge) and
+         streamed to the output.
+
+    Inputs can be InfluxDB annotated CSV exports (the #group/#datatype/
+    #default lines and the leading empty column are handled) or plain
+    exports like the MongoDB gyroscope_data.csv; several inputs are merged
+    into one time-ordered output. Quoted fields containing line breaks are
+    not supported, which none of these exports use.
+
+    The output format follows the extension: .skc (sensorkit.codec, typed
+    and compressed), .parquet (needs pyarrow) or .csv.
+
+    Usage:
+        python -m sensorkit clean 5.2D/influxdata_2024-09-04T13_57_00Z.csv
+        python -m sensorkit clean export1.csv export2.csv -o clean.parquet --workers 8
+"""
+
+import datetime
+import os
+import sys
+import time
+
+CHUNK_BYTES = 64 * 1024 * 1024
+MERGE_BUFFER_BYTES = 32 * 1024 * 1024
+MAX_SCALE = 6
+
+# Columns of Influx exports that are bookkeeping rather than readings
+_SKIP_COLUMNS = {'', 'result', 'table'}
+
+
+# --- input -------------------------------------------------------------------
+
+def _parse_header(line):
+    return [name.strip().strip('"') for name in line.rstrip('\r\n').split(',')]
+
+
+def inspect_export(path):
+    """Return (header, data_offset) of a CSV export, skipping Influx annotation lines."""
+    with open(path, 'rb') as f:
+        while True:
+            line = f.readline()
+            if not line:
+                raise ValueError(f"{path}: no header line")
+            if line.startswith(b'#') or not line.strip():
+                continue
+            return _parse_header(line.decode('utf-8-sig')), f.tell()
+
+
+def split_ranges(path, start, chunk_bytes=CHUNK_BYTES):
+    """Byte ranges [start, end) of the data section, each ending on a line break."""
+    size = os.path.getsize(path)
+    ranges = []
+    with open(path, 'rb') as f:
+        while start < size:
+            f.seek(min(start + chunk_bytes, size))
+            f.readline()
+            end = min(f.tell(), size)
+            ranges.append((start, end))
+            start = end
+    return ranges
+
+
+def choose_columns(header, time_column=None, columns=None):
+    if time_column is None:
+        time_column = next((name for name in header if 'time' in name.lower()), None)
+        if time_column is None:
+            raise ValueError(f"No time column in {header}")
+    if columns is None:
+        columns = [name for name in header if name != time_column and name.lower() not in _SKIP_COLUMNS]
+    missing = [name for name in [time_column] + list(columns) if name not in header]
+    if missing:
+        raise ValueError(f"Columns {missing} not in {header}")
+    return time_column, list(columns)
+
+
+# --- workers -----------------------------------------------------------------
+
+def _decimals(values):
+    """Fewest decimals (<= MAX_SCALE) that represent every value exactly, or None."""
+    import numpy as np
+
+    for scale in range(MAX_SCALE + 1):
+        scaled = values * 10**scale
+        if np.array_equal(np.round(scaled) / 10**scale, values):
+            return scale
+    return None
+
+
+def clean_chunk(task):
+    """
+    Clean one byte range and write it as a sorted run.
+
+    task is (path, start, end, header, time_column, columns, run_path);
+    returns (run_path, rows_read, rows_kept, {column: decimals}).
+    """
+    import io
+    import numpy as np
+    import pandas as pd
+
+    path, start, end, header, time_column, columns, run_path = task
+    with open(path, 'rb') as f:
+        f.seek(start)
+        data = f.read(end - start)
+
+    df = pd.read_csv(io.BytesIO(data), header=None, names=header, usecols=[time_column] + columns,
+                     dtype={time_column: str}, skip_blank_lines=True)
+    rows_read = len(df)
+
+    # Annotation and header lines repeated between Influx tables end up as
+    # invalid timestamps here and are dropped with the rest
+    stamps = pd.to_datetime(df[time_column], format='ISO8601', utc=True, errors='coerce')
+    keep = stamps.notna().to_numpy(copy=True)
+    values = np.empty((rows_read, len(columns)))
+    for i, name in enumerate(columns):
+        values[:, i] = pd.to_numeric(df[name], errors='coerce')
+    keep &= ~np.isnan(values).any(axis=1)
+
+    timestamps = stamps[keep].dt.tz_convert(None).dt.as_unit('ns').to_numpy().view('int64')
+    values = values[keep]
+    order = np.argsort(timestamps, kind='stable')
+
+    run = np.empty(len(order), dtype=run_dtype(columns))
+    run['t'] = timestamps[order]
+    for i, name in enumerate(columns):
+        run[name] = values[order, i]
+    np.save(run_path, run)
+
+    scales = {name: _decimals(values[:, i]) for i, name in enumerate(columns)}
+    return run_path, rows_read, len(run), scales
+
+
+def run_dtype(columns):
+    import numpy as np
+
+    return np.dtype([('t', '<i8')] + [(name, '<f8') for name in columns])
+
+
+# --- merge -------------------------------------------------------------------
+
+def merge_runs(run_paths, block_rows):
+    """Yield structured arrays in timestamp order from sorted run files (k-way merge)."""
+    import numpy as np
+
+    runs = [np.load(path, mmap_mode='r') for path in run_paths]
+    runs = [run for run in runs if len(run)]
+    if len(runs) == 1:
+        run = runs[0]
+        for start in range(0, len(run), block_rows):
+            yield np.array(run[start:start + block_rows])
+        return
+
+    positions = [0] * len(runs)
+    buffers = [run[:0] for run in runs]
+    while True:
+        # Top up every buffer to block_rows from its run
+        for i, run in enumerate(runs):
+            if len(buffers[i]) < block_rows and positions[i] < len(run):
+                take = block_rows - len(buffers[i])
+                buffers[i] = np.concatenate([buffers[i], run[positions[i]:positions[i] + take]])
+                positions[i] += take
+        live = [i for i, b in enumerate(buffers) if len(b)]
+        if not live:
+            return
+
+        # Everything up to the smallest last timestamp among runs with more
+        # rows still on disk is final; runs fully in memory impose no bound
+        bounds = [buffers[i]['t'][-1] for i in live if positions[i] < len(runs[i])]
+        cutoff = min(bounds) if bounds else None
+        parts = []
+        for i in live:
+            n = len(buffers[i]) if cutoff is None else np.searchsorted(buffers[i]['t'], cutoff, side='right')
+            parts.append(buffers[i][:n])
+            buffers[i] = buffers[i][n:]
+        block = np.concatenate(parts)
+        yield block[np.argsort(block['t'], kind='stable')]
+
+
+# --- output ------------------------------------------------------------------
+
+class SkcOutput:
+    def __init__(self, path, columns, scales):
+        from sensorkit import codec
+
+        self.file = open(path, 'wb')
+        meta = {'time_column': 'timestamp', 'time_format': 'iso', 'time_digits': 6}
+        self.writer = codec.ArchiveWriter(self.file, columns, scales, meta=meta)
+        self.columns = columns
+
+    def write(self, block):
+        # The codec works on Python lists; convert one archive block at a time
+        step = self.writer.block_rows
+        for start in range(0, len(block), step):
+            part = block[start:start + step]
+            self.writer.write(part['t'].tolist(), {name: part[name].tolist() for name in self.columns})
+
+    def close(self):
+        self.writer.close()
+        self.file.close()
+
+
+class ParquetOutput:
+    def __init__(self, path, columns, scales):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        self.pa = pa
+        self.columns = columns
+        self.schema = pa.schema([('timestamp', pa.timestamp('ns'))] + [(name, pa.float64()) for name in columns])
+        self.writer = pq.ParquetWriter(path, self.schema)
+
+    def write(self, block):
+        arrays = [self.pa.array(block['t'].view('datetime64[ns]'))]
+        arrays += [self.pa.array(block[name]) for name in self.columns]
+        self.writer.write_table(self.pa.Table.from_arrays(arrays, schema=self.schema))
+
+    def close(self):
+        self.writer.close()
+
+
+class CsvOutput:
+    """Same layout as the notebooks' clean_gyroscope_data_*.csv."""
+
+    def __init__(self, path, columns, scales):
+        self.file = open(path, 'w', newline='')
+        self.columns = columns
+        self.formats = ['%.{}f'.format(s) if s is not None else '%r' for s in (scales.get(c) for c in columns)]
+        self.file.write(','.join(['timestamp'] + columns) + '\n')
+
+    def write(self, block):
+        import pandas as pd
+
+        stamps = pd.DatetimeIndex(block['t'].view('datetime64[ns]')).strftime('%Y-%m-%d %H:%M:%S.%f')
+        values = [[fmt % v for v in block[name].tolist()] for fmt, name in zip(self.formats, self.columns)]
+        self.file.writelines(','.join(row) + '\n' for row in zip(stamps, *values))
+
+    def close(self):
+        self.file.close()
+
+
+OUTPUTS = {'.skc': SkcOutput, '.parquet': ParquetOutput, '.csv': CsvOutput}
+
+
+# --- pipeline ----------------------------------------------------------------
+
+def _combine_scales(results, columns):
+    scales = {}
+    for name in columns:
+        found = [r[3][name] for r in results if r[2]]
+        scales[name] = None if any(s is None for s in found) else max(found, default=0)
+    return scales
+
+
+def clean_exports(paths, out_path, time_column=None, columns=None, workers=None,
+                  chunk_bytes=CHUNK_BYTES, tmp_dir=None):
+    """Clean and merge the exports into out_path; returns a dict of counts."""
+    import tempfile
+    from multiprocessing import Pool
+
+    ext = os.path.splitext(out_path)[1].lower()
+    if ext not in OUTPUTS:
+        raise ValueError(f"Unsupported output {out_path!r}; use one of {sorted(OUTPUTS)}")
+    workers = workers or os.cpu_count() or 1
+    started = time.perf_counter()
+
+    with tempfile.TemporaryDirectory(dir=tmp_dir, prefix='sensorkit-clean-') as tmp:
+        tasks = []
+        out_columns = columns
+        for path in paths:
+            header, offset = inspect_export(path)
+            t_col, v_cols = choose_columns(header, time_column, out_columns)
+            out_columns = v_cols  # later inputs must carry the same columns
+            for start, end in split_ranges(path, offset, chunk_bytes):
+                tasks.append((path, start, end, header, t_col, v_cols,
+                              os.path.join(tmp, f'run{len(tasks):05d}.npy')))
+
+        if workers > 1 and len(tasks) > 1:
+            with Pool(min(workers, len(tasks))) as pool:
+                results = list(pool.imap_unordered(clean_chunk, tasks))
+        else:
+            results = [clean_chunk(task) for task in tasks]
+        results.sort()
+
+        scales = _combine_scales(results, out_columns)
+        block_rows = max(1024, MERGE_BUFFER_BYTES // (max(len(results), 1) * run_dtype(out_columns).itemsize))
+        output = OUTPUTS[ext](out_path, out_columns, scales)
+        try:
+            for block in merge_runs([r[0] for r in results], block_rows):
+                output.write(block)
+        finally:
+            output.close()
+
+    rows_read = sum(r[1] for r in results)
+    rows_kept = sum(r[2] for r in results)
+    return {'inputs': len(paths), 'runs': len(results), 'rows_read': rows_read,
+            'rows_written': rows_kept, 'rows_dropped': rows_read - rows_kept,
+            'seconds': time.perf_counter() - started}
+
+
+def default_output(ext='.skc'):
+    # Same naming as the 5.2D notebook
+    current_time = datetime.datetime.now().strftime('%Y%m%d_%H%M%S')
+    return f'clean_gyroscope_data_{current_time}{ext}'
+
+
+def add_arguments(parser):
+    parser.add_argument('inputs', nargs='+', help='InfluxDB or MongoDB CSV exports')
+    parser.add_argument('-o', '--out', help='output .skc, .parquet or .csv (default clean_gyroscope_data_<time>.skc)')
+    parser.add_argument('--workers', type=int, help='worker processes (default: all cores)')
+    parser.add_argument('--chunk-mb', type=float, default=CHUNK_BYTES / 2**20, help='bytes per worker task')
+    parser.add_argument('--time-column', help='timestamp column (default: first name containing "time")')
+    parser.add_argument('--columns', help='comma separated value columns (default: all others)')
+    parser.add_argument('--tmp', help='directory for the sorted runs (default: system temp)')
+
+
+def run(args):
+    out = args.out or default_output()
+    columns = args.columns.split(',') if args.columns else None
+    stats = clean_exports(args.inputs, out, time_column=args.time_column, columns=columns,
+                          workers=args.workers, chunk_bytes=int(args.chunk_mb * 2**20), tmp_dir=args.tmp)
+    print(f"Cleaned {stats['rows_read']} rows from {stats['inputs']} file(s) in {stats['runs']} run(s): "
+          f"{stats['rows_written']} written to {out}, {stats['rows_dropped']} dropped "
+          f"({stats['seconds']:.2f} s)")
+    return 0
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    add_arguments(parser)
+    return run(parser.parse_args(argv))
+
+
+if __name__ == '__main__':
+    sys.exit(main())
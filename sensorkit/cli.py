@@ -0,0 +1,228 @@
+"""
+    Single entry point for the scripts in this repository.
+
+        python -m sensorkit ingest dht22 --port /dev/cu.usbmodem1201
+        python -m sensorkit ingest ultrasonic --port /dev/tty.usbmodem1301
+        python -m sensorkit dash [--app gyroscope|distance]
+        python -m sensorkit bokeh
+        python -m sensorkit streamlit
+        python -m sensorkit analyze [regression|stats]
+        python -m sensorkit export gyroscope_data.csv gyroscope_data.skc
+        python -m sensorkit serve [--port 8765]
+        python -m sensorkit clean 5.2D/influxdata_2024-09-04T13_57_00Z.csv [-o out.skc]
+        python -m sensorkit --metrics-port 9108 dash
+
+    --metrics-port exposes timers and counters of the wrapped script at
+    http://127.0.0.1:<port>/metrics (see sensorkit/metrics.py).
+
+    Nothing heavy is imported here. Each subcommand loads the task script it
+    wraps (and with it pandas, dash, bokeh, ...) only when it runs, so the
+    ingestion and export commands start in a fraction of a second.
+"""
+
+import argparse
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Subcommand target scripts, relative to the repository root
+SCRIPTS = {
+    'dht22': 'week-3/main.py',
+    'ultrasonic': 'week-2/wk2sensor.py',
+    'gyroscope': '6.2HD_plot/main.py',
+    'distance': '9.2HD/viz.py',
+    'bokeh': '6.2HD_plot/main1.py',
+    'streamlit': '6.2HD_plot/main2.py',
+    'regression': 'week-7/main.py',
+    'stats': 'week-3/graph.py',
+}
+
+
+def load_script(rel_path, chdir=True):
+    """
+    Import one of the task scripts by path and switch into its folder.
+
+    The folder names (6.2HD_plot, week-3, ...) are not valid package names,
+    and the scripts open their data files relative to their own folder.
+    """
+    import importlib.util
+
+    path = os.path.join(ROOT, rel_path)
+    folder = os.path.dirname(path)
+    if folder not in sys.path:
+        sys.path.insert(0, folder)
+    if chdir:
+        os.chdir(folder)
+
+    name = '_task_' + rel_path.replace('/', '_').replace('.', '_').replace('-', '_')
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def _abspath(path):
+    return os.path.abspath(path) if path else path
+
+
+def cmd_ingest(args):
+    out = _abspath(args.out)
+    module = load_script(SCRIPTS[args.sensor])
+    if args.sensor == 'dht22':
+        if args.port:
+            module.SERIAL_PORT = args.port
+        if args.baud:
+            module.BAUD_RATE = args.baud
+        if out:
+            module.CSV_FILE = out
+    else:
+        if args.port:
+            module.arduino_port = args.port
+        if args.baud:
+            module.baud_rate = args.baud
+        if out:
+            module.csv_file = out
+    module.main()
+
+
+def cmd_dash(args):
+    data = _abspath(args.data)
+    module = load_script(SCRIPTS[args.app])
+    kwargs = {'debug': args.debug}
+    if args.port:
+        kwargs['port'] = args.port
+    if data:
+        kwargs['file_path'] = data
+    if args.service and args.app == 'gyroscope':
+        kwargs['service_url'] = args.service
+    module.main(**kwargs)
+
+
+def cmd_bokeh(args):
+    module = load_script(SCRIPTS['bokeh'])
+    module.main(port=args.port, show=not args.no_show)
+
+
+def cmd_streamlit(args):
+    import subprocess
+
+    path = os.path.join(ROOT, SCRIPTS['streamlit'])
+    command = [sys.executable, '-m', 'streamlit', 'run', path, '--server.port', str(args.port)]
+    return subprocess.call(command, cwd=os.path.dirname(path))
+
+
+def cmd_analyze(args):
+    data = _abspath(args.data)
+    module = load_script(SCRIPTS[args.kind])
+    if data:
+        module.main(file_path=data)
+    else:
+        module.main()
+
+
+def cmd_export(args):
+    from sensorkit import codec
+
+    if args.src.endswith('.skc'):
+        rows = codec.unpack_csv(args.src, args.dst)
+        print(f"Unpacked {rows} rows to {args.dst}")
+    else:
+        size = codec.pack_csv(args.src, args.dst, block_rows=args.block_rows, skiprows=args.skiprows)
+        print(f"Packed {args.src} -> {args.dst} ({size} bytes)")
+
+
+def cmd_serve(args):
+    from sensorkit import query_service
+
+    datasets = None
+    if args.dataset:
+        datasets = {name: (os.path.join(query_service.ROOT, path), column)
+                    for name, (path, column) in query_service.DATASETS.items()}
+        for spec in args.dataset:
+            name, _, path = spec.partition('=')
+            datasets[name] = (os.path.abspath(path), None)
+    query_service.serve(port=args.port, datasets=datasets, host=args.host)
+
+
+def cmd_clean(args):
+    from sensorkit import cleaning
+
+    return cleaning.run(args)
+
+
+def build_parser():
+    from sensorkit import cleaning  # stdlib only; pandas is imported by the workers
+
+    parser = argparse.ArgumentParser(prog='sensorkit', description='SIT225 sensor tools')
+    parser.add_argument('--metrics-port', type=int, metavar='PORT',
+                        help='collect metrics and serve them on this local port')
+    parser.add_argument('--profile-slow', type=float, metavar='SECONDS',
+                        help='print sampled stacks of timed calls slower than this (needs --metrics-port)')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    p = sub.add_parser('ingest', help='log a serial sensor to CSV')
+    p.add_argument('sensor', choices=['dht22', 'ultrasonic'])
+    p.add_argument('--port', help='serial port of the Arduino')
+    p.add_argument('--baud', type=int)
+    p.add_argument('--out', help='CSV file to write')
+    p.set_defaults(func=cmd_ingest)
+
+    p = sub.add_parser('dash', help='run a Dash dashboard')
+    p.add_argument('--app', choices=['gyroscope', 'distance'], default='gyroscope')
+    p.add_argument('--data', help='CSV file to load instead of the default')
+    p.add_argument('--port', type=int)
+    p.add_argument('--debug', action='store_true')
+    p.add_argument('--service', metavar='URL',
+                   help='fetch windows from a running query service (gyroscope app only)')
+    p.set_defaults(func=cmd_dash)
+
+    p = sub.add_parser('bokeh', help='run the Bokeh gyroscope dashboard')
+    p.add_argument('--port', type=int, default=5006)
+    p.add_argument('--no-show', action='store_true', help='do not open a browser')
+    p.set_defaults(func=cmd_bokeh)
+
+    p = sub.add_parser('streamlit', help='run the Streamlit gyroscope dashboard')
+    p.add_argument('--port', type=int, default=8501)
+    p.set_defaults(func=cmd_streamlit)
+
+    p = sub.add_parser('analyze', help='run the DHT22 analysis scripts')
+    p.add_argument('kind', nargs='?', choices=['regression', 'stats'], default='regression')
+    p.add_argument('--data', help='CSV file to analyse instead of the default')
+    p.set_defaults(func=cmd_analyze)
+
+    p = sub.add_parser('export', help='convert between CSV and the compressed archive format')
+    p.add_argument('src', help='CSV to pack, or .skc archive to unpack')
+    p.add_argument('dst')
+    p.add_argument('--block-rows', type=int, default=1024)
+    p.add_argument('--skiprows', type=int, default=0, help='lines to skip before the CSV header')
+    p.set_defaults(func=cmd_export)
+
+    p = sub.add_parser('serve', help='run the local time-range query service')
+    p.add_argument('--port', type=int, default=8765)
+    p.add_argument('--host', default='127.0.0.1')
+    p.add_argument('--dataset', action='append', metavar='NAME=PATH',
+                   help='serve another CSV or .skc file (repeatable)')
+    p.set_defaults(func=cmd_serve)
+
+    p = sub.add_parser('clean', help='clean and merge InfluxDB/MongoDB exports out of core')
+    cleaning.add_arguments(p)
+    p.set_defaults(func=cmd_clean)
+
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.metrics_port:
+        # Set through the environment so streamlit's subprocess picks it up too
+        os.environ['SENSORKIT_METRICS'] = '1'
+        os.environ['SENSORKIT_METRICS_PORT'] = str(args.metrics_port)
+        if args.profile_slow:
+            os.environ['SENSORKIT_PROFILE_SLOW'] = str(args.profile_slow)
+    return args.func(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,525 @@
+"""
+    Compact archive format for the recorded sensor CSVs.
+
+    Timestamps are stored as zigzag varints of their delta-of-delta, which
+    costs about one byte per row for a logger that samples at a steady rate.
+    Value columns that only ever carry a few decimals (gyroscope, DHT22,
+    ultrasonic) are stored as fixed-point integers and delta encoded; any
+    other column falls back to XOR-ing the float64 bit pattern with the
+    previous value. Rows are grouped into blocks and a footer keeps the
+    offset and first timestamp of every block, so a time range can be read
+    without decoding the whole file. The header remembers how the source
+    wrote its timestamps, numbers and line endings, so unpacking a packed
+    recording gives back the same text.
+
+    Only the standard library is used so the ingestion commands stay cheap
+    to start.
+
+    Usage:
+        python -m sensorkit.codec pack gyroscope_data.csv gyroscope_data.skc
+        python -m sensorkit.codec unpack gyroscope_data.skc restored.csv
+"""
+
+import bisect
+import csv
+import io
+import json
+import mmap
+import os
+import re
+import struct
+import sys
+from datetime import datetime, timezone
+
+MAGIC = b'SKC1'
+BLOCK_ROWS = 1024
+MAX_SCALE = 6
+
+_EPOCH = datetime(1970, 1, 1)
+_NUMBER = re.compile(r'^[-+]?\d+(?:\.(\d*))?$')
+_ISO_TIME = re.compile(
+    r'^(\d{4}-\d{2}-\d{2})[ T](\d{2}):(\d{2}):(\d{2})(?:\.(\d+))?Z?$')
+_EPOCH_TIME = re.compile(r'^(\d+)(?:\.(\d+))?$')
+
+
+# --- varints -----------------------------------------------------------------
+
+def _zigzag(n):
+    return (n << 1) if n >= 0 else ((-n << 1) - 1)
+
+
+def _unzigzag(n):
+    return (n >> 1) if not n & 1 else -((n + 1) >> 1)
+
+
+def _put_varint(out, n):
+    while n > 0x7F:
+        out.append((n & 0x7F) | 0x80)
+        n >>= 7
+    out.append(n)
+
+
+def _get_varint(buf, pos):
+    result = 0
+    shift = 0
+    while True:
+        b = buf[pos]
+        pos += 1
+        result |= (b & 0x7F) << shift
+        if b < 0x80:
+            return result, pos
+        shift += 7
+
+
+# --- timestamps --------------------------------------------------------------
+
+def parse_timestamp(text):
+    """Parse an ISO or epoch-seconds timestamp into (nanoseconds, kind, digits)."""
+    text = text.strip()
+    m = _ISO_TIME.match(text)
+    if m:
+        date, hh, mm, ss, frac = m.groups()
+        frac = frac or ''
+        base = datetime.strptime(f"{date} {hh}:{mm}:{ss}", '%Y-%m-%d %H:%M:%S')
+        delta = base - _EPOCH
+        seconds = delta.days * 86400 + delta.seconds
+        return seconds * 10**9 + int((frac + '000000000')[:9]), 'iso', min(len(frac), 9)
+    m = _EPOCH_TIME.match(text)
+    if m:
+        whole, frac = m.groups()
+        frac = frac or ''
+        return int(whole) * 10**9 + int((frac + '000000000')[:9]), 'epoch', min(len(frac), 9)
+    raise ValueError(f"Unrecognised timestamp: {text!r}")
+
+
+def format_timestamp(ns, kind='iso', digits=0, sep=' ', zone='', trim=False):
+    """
+    Inverse of parse_timestamp; naive ISO timestamps are treated as UTC.
+    sep and zone give the date/time separator and suffix of ISO stamps;
+    trim drops trailing zeros of the fraction instead of padding to digits.
+    """
+    seconds, frac = divmod(ns, 10**9)
+    frac_text = f"{frac:09d}"[:digits]
+    if kind == 'epoch':
+        frac_text = frac_text.rstrip('0')
+        return f"{seconds}.{frac_text}" if frac_text else str(seconds)
+    if kind == 'index':
+        return str(seconds)
+    if trim:
+        frac_text = frac_text.rstrip('0')
+    text = datetime.fromtimestamp(seconds, tz=timezone.utc).strftime(f'%Y-%m-%d{sep}%H:%M:%S')
+    return (f"{text}.{frac_text}" if frac_text else text) + zone
+
+
+# --- block encoding ----------------------------------------------------------
+
+def _encode_timestamps(out, timestamps):
+    prev = timestamps[0]
+    _put_varint(out, _zigzag(prev))
+    prev_delta = 0
+    for t in timestamps[1:]:
+        delta = t - prev
+        _put_varint(out, _zigzag(delta - prev_delta))
+        prev, prev_delta = t, delta
+
+
+def _decode_timestamps(buf, pos, n):
+    raw, pos = _get_varint(buf, pos)
+    prev = _unzigzag(raw)
+    result = [prev]
+    delta = 0
+    for _ in range(n - 1):
+        raw, pos = _get_varint(buf, pos)
+        delta += _unzigzag(raw)
+        prev += delta
+        result.append(prev)
+    return result, pos
+
+
+def _encode_fixed(out, values, scale):
+    factor = 10 ** scale
+    prev = 0
+    for v in values:
+        q = int(round(v * factor))
+        _put_varint(out, _zigzag(q - prev))
+        prev = q
+
+
+def _decode_fixed(buf, pos, n, scale):
+    factor = 10 ** scale
+    result = []
+    q = 0
+    for _ in range(n):
+        raw, pos = _get_varint(buf, pos)
+        q += _unzigzag(raw)
+        result.append(q / factor)
+    return result, pos
+
+
+def _encode_xor(out, values):
+    # Byte aligned variant of the Gorilla float encoding: a zero byte when the
+    # value repeats, otherwise one byte holding the number of leading and
+    # trailing zero bytes of the XOR followed by the bytes in between.
+    prev = 0
+    for (bits,) in struct.iter_unpack('<Q', struct.pack(f'<{len(values)}d', *values)):
+        x = bits ^ prev
+        prev = bits
+        if not x:
+            out.append(0)
+            continue
+        raw = x.to_bytes(8, 'big')
+        lead = (64 - x.bit_length()) // 8
+        trail = 0
+        while raw[7 - trail] == 0:
+            trail += 1
+        out.append((lead << 4) | trail | 0x80)
+        out += raw[lead:8 - trail]
+
+
+def _decode_xor(buf, pos, n):
+    bits = []
+    prev = 0
+    for _ in range(n):
+        head = buf[pos]
+        pos += 1
+        if head:
+            lead, trail = (head >> 4) & 0x7, head & 0x0F
+            width = 8 - lead - trail
+            prev ^= int.from_bytes(buf[pos:pos + width], 'big') << (8 * trail)
+            pos += width
+        bits.append(prev)
+    return list(struct.unpack(f'<{n}d', struct.pack(f'<{n}Q', *bits))), pos
+
+
+def _encode_block(timestamps, columns, scales):
+    out = bytearray()
+    _put_varint(out, len(timestamps))
+    _encode_timestamps(out, timestamps)
+    for values, scale in zip(columns, scales):
+        if scale is None:
+            _encode_xor(out, values)
+        else:
+            _encode_fixed(out, values, scale)
+    return out
+
+
+def _decode_block(buf, pos, scales):
+    n, pos = _get_varint(buf, pos)
+    timestamps, pos = _decode_timestamps(buf, pos, n)
+    columns = []
+    for scale in scales:
+        if scale is None:
+            values, pos = _decode_xor(buf, pos, n)
+        else:
+            values, pos = _decode_fixed(buf, pos, n, scale)
+        columns.append(values)
+    return timestamps, columns
+
+
+# --- archive -----------------------------------------------------------------
+
+def detect_scale(tokens):
+    """Return the number of decimals that represents every token exactly, or None."""
+    scale = 0
+    for token in tokens:
+        m = _NUMBER.match(token.strip())
+        if not m:
+            return None
+        if m.group(1):
+            scale = max(scale, len(m.group(1)))
+            if scale > MAX_SCALE:
+                return None
+    return scale
+
+
+def encode(timestamps, columns, scales=None, block_rows=BLOCK_ROWS, meta=None):
+    """
+    Encode integer nanosecond timestamps plus a dict of float columns.
+
+    scales gives the number of decimals for each column, None meaning the
+    column is stored losslessly with XOR encoding.
+    """
+    out = io.BytesIO()
+    writer = ArchiveWriter(out, list(columns), scales, block_rows=block_rows, meta=meta)
+    writer.write(timestamps, columns)
+    writer.close()
+    return out.getvalue()
+
+
+class ArchiveWriter:
+    """
+    Write an archive to a binary stream in pieces, for data that does not
+    fit in memory. Rows must arrive in timestamp order for read_range to work.
+    """
+
+    def __init__(self, stream, names, scales=None, block_rows=BLOCK_ROWS, meta=None):
+        self.stream = stream
+        self.names = list(names)
+        self.block_rows = block_rows
+        self.scales = [(scales or {}).get(name) for name in self.names]
+        self.index = []
+        self._timestamps = []
+        self._columns = [[] for _ in self.names]
+
+        header = dict(meta or {}, columns=self.names, scales=self.scales, block_rows=block_rows)
+        header_bytes = json.dumps(header).encode('utf-8')
+        out = bytearray(MAGIC)
+        _put_varint(out, len(header_bytes))
+        out += header_bytes
+        self._offset = 0
+        self._emit(out)
+
+    def _emit(self, data):
+        self.stream.write(data)
+        self._offset += len(data)
+
+    def write(self, timestamps, columns):
+        """Append rows; columns maps every name to a sequence as long as timestamps."""
+        values = [columns[name] for name in self.names]
+        n = len(timestamps)
+        pos = 0
+
+        # Complete a partly filled block first
+        if self._timestamps:
+            pos = min(self.block_rows - len(self._timestamps), n)
+            self._timestamps += timestamps[:pos]
+            for buffer, column in zip(self._columns, values):
+                buffer += column[:pos]
+            if len(self._timestamps) < self.block_rows:
+                return
+            self._block(self._timestamps, self._columns)
+            self._timestamps = []
+            self._columns = [[] for _ in self.names]
+
+        # Whole blocks straight from the input; only the tail is buffered
+        while n - pos >= self.block_rows:
+            stop = pos + self.block_rows
+            self._block(timestamps[pos:stop], [column[pos:stop] for column in values])
+            pos = stop
+        if pos < n:
+            self._timestamps = list(timestamps[pos:])
+            self._columns = [list(column[pos:]) for column in values]
+
+    def _block(self, timestamps, columns):
+        self.index.append((self._offset, len(timestamps), timestamps[0]))
+        self._emit(_encode_block(timestamps, columns, self.scales))
+
+    def close(self):
+        if self._timestamps:
+            self._block(self._timestamps, self._columns)
+            self._timestamps = []
+        footer_offset = self._offset
+        out = bytearray()
+        _put_varint(out, len(self.index))
+        for offset, rows, first in self.index:
+            _put_varint(out, offset)
+            _put_varint(out, rows)
+            _put_varint(out, _zigzag(first))
+        out += struct.pack('<Q', footer_offset)
+        self._emit(out)
+
+
+class ArchiveReader:
+    """
+    Random access reader over an encoded archive, given as bytes or a path.
+    Files are memory mapped, so only the blocks that get decoded are read.
+    """
+
+    def __init__(self, data):
+        self._mmap = None
+        if isinstance(data, str):
+            with open(data, 'rb') as f:
+                if os.fstat(f.fileno()).st_size < 4 + 8:
+                    raise ValueError("Not a sensor archive")
+                data = self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if data[:4] != MAGIC:
+            raise ValueError("Not a sensor archive")
+        self.data = data
+
+        size, pos = _get_varint(data, 4)
+        self.header = json.loads(data[pos:pos + size].decode('utf-8'))
+        self.columns = self.header['columns']
+        self.scales = self.header['scales']
+
+        (footer,) = struct.unpack('<Q', data[-8:])
+        count, pos = _get_varint(data, footer)
+        self.offsets, self.rows, self.starts = [], [], []
+        for _ in range(count):
+            offset, pos = _get_varint(data, pos)
+            rows, pos = _get_varint(data, pos)
+            first, pos = _get_varint(data, pos)
+            self.offsets.append(offset)
+            self.rows.append(rows)
+            self.starts.append(_unzigzag(first))
+
+    def __len__(self):
+        return sum(self.rows)
+
+    def close(self):
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    @property
+    def block_count(self):
+        return len(self.offsets)
+
+    def read_block(self, i):
+        """Decode block i into (timestamps, {column: values})."""
+        timestamps, values = _decode_block(self.data, self.offsets[i], self.scales)
+        return timestamps, dict(zip(self.columns, values))
+
+    def read_all(self):
+        return self._read_blocks(range(self.block_count))
+
+    def read_range(self, start_ns, end_ns):
+        """Return the rows with start_ns <= timestamp < end_ns, decoding only the blocks involved."""
+        first = max(bisect.bisect_right(self.starts, start_ns) - 1, 0)
+        last = bisect.bisect_left(self.starts, end_ns)
+        timestamps, columns = self._read_blocks(range(first, last))
+        lo = bisect.bisect_left(timestamps, start_ns)
+        hi = bisect.bisect_left(timestamps, end_ns)
+        return timestamps[lo:hi], {name: values[lo:hi] for name, values in columns.items()}
+
+    def _read_blocks(self, blocks):
+        timestamps = []
+        columns = {name: [] for name in self.columns}
+        for i in blocks:
+            ts, values = self.read_block(i)
+            timestamps += ts
+            for name in self.columns:
+                columns[name] += values[name]
+        return timestamps, columns
+
+
+def decode(data):
+    """Decode a whole archive into (timestamps, {column: values})."""
+    return ArchiveReader(data).read_all()
+
+
+# --- CSV helpers -------------------------------------------------------------
+
+def _shortest(value, bare_ints=False):
+    text = repr(value)
+    return text[:-2] if bare_ints and text.endswith('.0') else text
+
+
+def read_csv(source, time_column=None, skiprows=0):
+    """Read a sensor CSV (path or text stream) into (timestamps, columns, scales, meta)."""
+    if isinstance(source, str):
+        with open(source, newline='', encoding='utf-8') as f:
+            return read_csv(f, time_column, skiprows)
+    for _ in range(skiprows):
+        next(source)
+    first = next(source)
+    header = next(csv.reader([first]))
+    rows = [row for row in csv.reader(source) if row]
+
+    if time_column is None:
+        time_column = next((name for name in header if 'time' in name.lower()), None)
+    value_names = [name for name in header if name and name != time_column]
+
+    meta = {'time_column': time_column, 'time_format': 'index', 'time_digits': 0,
+            'newline': '\r\n' if first.endswith('\r\n') else '\n'}
+    if time_column is None:
+        timestamps = [i * 10**9 for i in range(len(rows))]
+    else:
+        t_idx = header.index(time_column)
+        timestamps = []
+        widths = set()
+        for row in rows:
+            ns, kind, digits = parse_timestamp(row[t_idx])
+            timestamps.append(ns)
+            widths.add(digits)
+            meta['time_format'] = kind
+            meta['time_digits'] = max(meta['time_digits'], digits)
+        if rows and meta['time_format'] == 'iso':
+            # Keep the look of the source: '2024-09-02T14:37:47.99812592Z' style
+            # exports use a T and Z and print fractions without trailing zeros
+            first = rows[0][t_idx].strip()
+            meta['time_sep'] = first[10]
+            meta['time_zone'] = 'Z' if first.endswith('Z') else ''
+            meta['time_trim'] = len(widths) > 1
+
+    columns, scales = {}, {}
+    meta['shortest'] = {}
+    for name in value_names:
+        idx = header.index(name)
+        tokens = [row[idx] for row in rows]
+        scales[name] = detect_scale(tokens)
+        columns[name] = [float(t) if t.strip() else float('nan') for t in tokens]
+        # '-1.1' next to '-2.08' (or '8' next to '7.5'): print the shortest text back
+        for bare_ints in (False, True):
+            if tokens and all(t == _shortest(v, bare_ints) for t, v in zip(tokens, columns[name])):
+                meta['shortest'][name] = bare_ints
+                break
+    return timestamps, columns, scales, meta
+
+
+def write_csv(target, timestamps, columns, meta):
+    """Write decoded rows to a path or text stream, formatting values like the originals."""
+    if isinstance(target, str):
+        with open(target, 'w', newline='', encoding='utf-8') as f:
+            return write_csv(f, timestamps, columns, meta)
+    header = meta.get('columns', list(columns))
+    scales = meta.get('scales', [None] * len(header))
+    kind, digits = meta.get('time_format', 'iso'), meta.get('time_digits', 0)
+    style = {'sep': meta.get('time_sep', ' '), 'zone': meta.get('time_zone', ''),
+             'trim': meta.get('time_trim', False)}
+    shortest = meta.get('shortest', {})
+    formats = ['{:.%df}' % s if s is not None else '{!r}' for s in scales]
+
+    def values(i):
+        return [_shortest(columns[name][i], shortest[name]) if name in shortest
+                else fmt.format(columns[name][i]) for fmt, name in zip(formats, header)]
+
+    writer = csv.writer(target, lineterminator=meta.get('newline', '\n'))
+    if 'time_column' in meta and meta['time_column'] is None:
+        # the source had no time column; the row index was stored in its place
+        writer.writerow(header)
+        for i in range(len(timestamps)):
+            writer.writerow(values(i))
+        return
+    writer.writerow([meta.get('time_column') or 'timestamp'] + header)
+    for i, ts in enumerate(timestamps):
+        writer.writerow([format_timestamp(ts, kind, digits, **style)] + values(i))
+
+
+def pack_csv(csv_path, out_path, block_rows=BLOCK_ROWS, skiprows=0):
+    timestamps, columns, scales, meta = read_csv(csv_path, skiprows=skiprows)
+    data = encode(timestamps, columns, scales, block_rows=block_rows, meta=meta)
+    with open(out_path, 'wb') as f:
+        f.write(data)
+    return len(data)
+
+
+def unpack_csv(archive_path, out_path):
+    with ArchiveReader(archive_path) as reader:
+        timestamps, columns = reader.read_all()
+    write_csv(out_path, timestamps, columns, reader.header)
+    return len(timestamps)
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if len(argv) != 3 or argv[0] not in ('pack', 'unpack'):
+        print(__doc__.strip().split('Usage:')[1])
+        return 2
+    command, src, dst = argv
+    if command == 'pack':
+        size = pack_csv(src, dst)
+        print(f"Packed {src} -> {dst} ({size} bytes)")
+    else:
+        rows = unpack_csv(src, dst)
+        print(f"Unpacked {rows} rows to {dst}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
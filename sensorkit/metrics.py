@@ -0,0 +1,298 @@
+"""
+    Lightweight instrumentation for the dashboards and serial loggers.
+
+    Counters, gauges and latency histograms are kept in one process-wide
+    registry and exposed in the Prometheus text format on a local HTTP
+    endpoint (GET /metrics). Everything is off by default: while disabled,
+    a timed() function costs one attribute check per call and inc()/observe()
+    return immediately.
+
+    Enable with the environment variable SENSORKIT_METRICS=1 (optionally
+    SENSORKIT_METRICS_PORT, default 9108) or `python -m sensorkit
+    --metrics-port 9108 ...`. With SENSORKIT_PROFILE_SLOW=0.25 every timed
+    call is also sampled by a small stack-sampling profiler, and calls
+    slower than that many seconds have their hottest stacks printed.
+
+    Only the standard library is used so the ingestion loops stay cheap to
+    start.
+"""
+
+import functools
+import os
+import sys
+import threading
+import time
+import traceback
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+DEFAULT_PORT = 9108
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = tuple(1024 * 4 ** i for i in range(8))  # 1 KiB .. 16 MiB
+
+
+def _env_enabled():
+    return os.environ.get('SENSORKIT_METRICS', '') not in ('', '0')
+
+
+class _State:
+    enabled = _env_enabled()
+    profile_slow = float(os.environ.get('SENSORKIT_PROFILE_SLOW', 0) or 0)
+
+
+_state = _State()
+_lock = threading.Lock()
+_counters = {}
+_gauges = {}
+_histograms = {}
+_help = {
+    'slow_calls_total': 'Timed calls slower than the --profile-slow threshold',
+}
+_server = None
+
+
+def enabled():
+    return _state.enabled
+
+
+def enable(profile_slow=None):
+    _state.enabled = True
+    if profile_slow is not None:
+        _state.profile_slow = profile_slow
+
+
+def disable():
+    _state.enabled = False
+
+
+def reset():
+    with _lock:
+        _counters.clear()
+        _gauges.clear()
+        _histograms.clear()
+
+
+def _key(name, labels):
+    return (name, tuple(sorted(labels.items())))
+
+
+def describe(name, text):
+    """Set the # HELP line for a metric."""
+    _help[name] = text
+
+
+def inc(name, amount=1, **labels):
+    if not _state.enabled:
+        return
+    key = _key(name, labels)
+    with _lock:
+        _counters[key] = _counters.get(key, 0) + amount
+
+
+def set_gauge(name, value, **labels):
+    if not _state.enabled:
+        return
+    with _lock:
+        _gauges[_key(name, labels)] = value
+
+
+def observe(name, value, buckets=LATENCY_BUCKETS, **labels):
+    if not _state.enabled:
+        return
+    key = _key(name, labels)
+    with _lock:
+        hist = _histograms.get(key)
+        if hist is None:
+            hist = _histograms[key] = [buckets, [0] * len(buckets), 0.0, 0]
+        bounds, counts = hist[0], hist[1]
+        for i, bound in enumerate(bounds):
+            if value <= bound:
+                counts[i] += 1
+                break
+        hist[2] += value
+        hist[3] += 1
+
+
+class timer:
+    """Context manager observing the elapsed seconds into a histogram."""
+
+    __slots__ = ('name', 'labels', 'start', 'samples')
+
+    def __init__(self, name, **labels):
+        self.name = name
+        self.labels = labels
+
+    def __enter__(self):
+        self.samples = None
+        if _state.enabled and _state.profile_slow:
+            self.samples = _sampler().watch(self)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        elapsed = time.perf_counter() - self.start
+        observe(self.name, elapsed, **self.labels)
+        if self.samples is not None:
+            _sampler().unwatch(self)
+            if elapsed >= _state.profile_slow:
+                inc('slow_calls_total', metric=self.name)
+                report(self.samples, f"{self.name} {self.labels} took {elapsed * 1000:.0f} ms")
+        return False
+
+
+def timed(name, **labels):
+    """Decorator timing every call of the function into histogram `name`."""
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _state.enabled:
+                return func(*args, **kwargs)
+            with timer(name, **labels):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+# --- sampling profiler -------------------------------------------------------
+
+class SamplingProfiler:
+    """
+    One daemon thread sampling the stacks of the threads inside a timed()
+    call every `interval` seconds, so slow callbacks can be explained
+    without cProfile's overhead. It sleeps while no call is being watched.
+    """
+
+    def __init__(self, interval=0.001, depth=8):
+        self.interval = interval
+        self.depth = depth
+        self._watched = {}  # token -> (thread id, Counter of stacks)
+        self._cond = threading.Condition()
+        threading.Thread(target=self._run, daemon=True).start()
+
+    def watch(self, token):
+        """Start sampling the calling thread on behalf of token; returns its Counter."""
+        samples = Counter()
+        with self._cond:
+            self._watched[id(token)] = (threading.get_ident(), samples)
+            self._cond.notify()
+        return samples
+
+    def unwatch(self, token):
+        with self._cond:
+            self._watched.pop(id(token), None)
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._watched:
+                    self._cond.wait()
+                watched = list(self._watched.values())
+            frames = sys._current_frames()
+            for thread_id, samples in watched:
+                frame = frames.get(thread_id)
+                if frame is not None:
+                    stack = traceback.extract_stack(frame, limit=self.depth)
+                    samples[tuple((f.filename, f.lineno, f.name) for f in stack)] += 1
+            del frames
+            time.sleep(self.interval)
+
+
+_profiler = None
+_profiler_lock = threading.Lock()
+
+
+def _sampler():
+    global _profiler
+    if _profiler is None:
+        with _profiler_lock:
+            if _profiler is None:
+                _profiler = SamplingProfiler()
+    return _profiler
+
+
+def report(samples, title, top=5, file=None):
+    """Print the hottest sampled stacks of one call."""
+    file = file or sys.stderr
+    total = sum(samples.values())
+    print(f"[slow call] {title}, {total} samples", file=file)
+    for stack, count in samples.most_common(top):
+        filename, lineno, func = stack[-1]
+        print(f"  {count / total:6.1%}  {func} ({os.path.basename(filename)}:{lineno})", file=file)
+        for filename, lineno, func in reversed(stack[:-1]):
+            print(f"           <- {func} ({os.path.basename(filename)}:{lineno})", file=file)
+
+
+# --- exposition --------------------------------------------------------------
+
+def _labels(pairs, extra=()):
+    pairs = tuple(pairs) + tuple(extra)
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{k}="{v}"' for k, v in pairs) + '}'
+
+
+def render():
+    """All metrics in the Prometheus text exposition format."""
+    lines = []
+    seen = set()
+
+    def header(name, kind):
+        if name not in seen:
+            seen.add(name)
+            if name in _help:
+                lines.append(f"# HELP {name} {_help[name]}")
+            lines.append(f"# TYPE {name} {kind}")
+
+    with _lock:
+        for (name, labels), value in sorted(_counters.items()):
+            header(name, 'counter')
+            lines.append(f"{name}{_labels(labels)} {value}")
+        for (name, labels), value in sorted(_gauges.items()):
+            header(name, 'gauge')
+            lines.append(f"{name}{_labels(labels)} {value}")
+        for (name, labels), (bounds, counts, total, count) in sorted(_histograms.items()):
+            header(name, 'histogram')
+            cumulative = 0
+            for bound, n in zip(bounds, counts):
+                cumulative += n
+                lines.append(f"{name}_bucket{_labels(labels, [('le', bound)])} {cumulative}")
+            lines.append(f"{name}_bucket{_labels(labels, [('le', '+Inf')])} {count}")
+            lines.append(f"{name}_sum{_labels(labels)} {total}")
+            lines.append(f"{name}_count{_labels(labels)} {count}")
+    return '\n'.join(lines) + '\n'
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split('?')[0] != '/metrics':
+            self.send_error(404)
+            return
+        body = render().encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain; version=0.0.4')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_http_server(port=DEFAULT_PORT, host='127.0.0.1'):
+    """Serve /metrics from a daemon thread; enables collection. Safe to call twice."""
+    global _server
+    enable()
+    if _server is None:
+        _server = ThreadingHTTPServer((host, port), _Handler)
+        threading.Thread(target=_server.serve_forever, daemon=True).start()
+        print(f"Metrics on http://{host}:{port}/metrics")
+    return _server
+
+
+def serve_from_env():
+    """Start the endpoint if SENSORKIT_METRICS is set; called from the apps' main()."""
+    if _state.enabled or _env_enabled():
+        if os.environ.get('SENSORKIT_PROFILE_SLOW'):
+            _state.profile_slow = float(os.environ['SENSORKIT_PROFILE_SLOW'])
+        start_http_server(int(os.environ.get('SENSORKIT_METRICS_PORT', DEFAULT_PORT)))
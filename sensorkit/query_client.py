@@ -0,0 +1,41 @@
+"""
+    Client for sensorkit.query_service. Only the standard library is needed
+    for fetch(); fetch_frame() turns the result into a DataFrame.
+"""
+
+import gzip
+import json
+from urllib.parse import urlencode
+from urllib.request import Request, urlopen
+
+DEFAULT_URL = 'http://127.0.0.1:8765'
+
+
+def fetch(dataset, url=DEFAULT_URL, timeout=10, **params):
+    """
+    Run a query and return the decoded response.
+
+    params are the query parameters of /query: start, end, columns, every,
+    agg, offset and limit. Lists are joined with commas.
+    """
+    params = {k: ','.join(v) if isinstance(v, (list, tuple)) else v
+              for k, v in params.items() if v is not None}
+    params['dataset'] = dataset
+    request = Request(f"{url}/query?{urlencode(params)}", headers={'Accept-Encoding': 'gzip'})
+    with urlopen(request, timeout=timeout) as response:
+        body = response.read()
+        if response.headers.get('Content-Encoding') == 'gzip':
+            body = gzip.decompress(body)
+    return json.loads(body)
+
+
+def fetch_frame(dataset, url=DEFAULT_URL, **params):
+    """Like fetch() but returns a DataFrame with a datetime 'timestamp' column."""
+    import pandas as pd
+
+    result = fetch(dataset, url, **params)
+    df = pd.DataFrame(result['columns'])
+    df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
+    df.attrs['total'] = result['total']
+    df.attrs['version'] = result['version']
+    return df
@@ -0,0 +1,273 @@
+"""
+    Local HTTP query service over the recorded sensor data.
+
+    Every dashboard and analysis script used to read whole CSVs into its own
+    DataFrame. This service loads each dataset once per host, keeps it
+    indexed by time and answers small queries:
+
+        GET /datasets
+        GET /query?dataset=gyroscope&start=2024-08-11T16:20&end=2024-08-11T16:30
+                  &every=10s&agg=mean,min,max,p95&columns=x,y
+        GET /query?dataset=gyroscope&offset=200&limit=100
+
+    Results are columnar JSON ({"columns": {"timestamp": [...], "x_mean":
+    [...]}}) with timestamps as epoch milliseconds, plus "total" (matching
+    samples, or non-empty buckets with `every`) and "rows" (returned after
+    offset/limit). Responses are gzip compressed when the client accepts
+    it and kept in an LRU cache keyed by the query and the dataset
+    version. A dataset is reloaded (and its version bumped) when
+    its file changes on disk.
+
+    Usage:
+        python -m sensorkit serve [--port 8765] [--dataset name=path ...]
+"""
+
+import gzip
+import json
+import math
+import os
+import threading
+import traceback
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from sensorkit.cache import LRUCache
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_PORT = 8765
+CACHE_SIZE = 256
+
+# name -> (path relative to the repository root, time column)
+DATASETS = {
+    'gyroscope': ('6.2HD_plot/gyroscope_data.csv', 'timestamp'),
+    'dht22': ('week-7/dht22_data.csv', 'Timestamp'),
+    'ultrasonic': ('week-2/ultrasonic_data.csv', 'Timestamp'),
+    'accelerometer': ('week-8/Python_Accelerometer_Combined.csv', 'timestamp'),
+}
+
+AGGREGATES = ('mean', 'min', 'max', 'median', 'std', 'sum', 'count', 'first', 'last')
+
+
+class QueryError(ValueError):
+    """Bad query parameters; reported to the client as HTTP 400."""
+
+
+class Dataset:
+    """One recorded file, loaded lazily and reloaded when it changes."""
+
+    def __init__(self, name, path, time_column=None):
+        self.name = name
+        self.path = path
+        self.time_column = time_column
+        self.version = 0
+        self._mtime = None
+        self._frame = None
+        self._lock = threading.Lock()
+
+    def frame(self):
+        mtime = os.path.getmtime(self.path)
+        if mtime != self._mtime:
+            with self._lock:
+                if mtime != self._mtime:
+                    self._frame = self._load()
+                    self._mtime = mtime
+                    self.version += 1
+        return self._frame
+
+    def _load(self):
+        import pandas as pd
+
+        if self.path.endswith('.skc'):
+            from sensorkit import codec
+
+            with codec.ArchiveReader(self.path) as reader:
+                timestamps, columns = reader.read_all()
+            df = pd.DataFrame(columns, index=pd.to_datetime(timestamps, unit='ns'))
+        else:
+            df = pd.read_csv(self.path)
+            column = self.time_column or next(c for c in df.columns if 'time' in c.lower())
+            times = df.pop(column)
+            if pd.api.types.is_numeric_dtype(times):
+                index = pd.to_datetime(times, unit='s')
+            else:
+                index = pd.to_datetime(times, errors='coerce', format='mixed')
+            df.index = index
+            df = df[df.index.notna()]
+        df.index.name = 'timestamp'
+        return df.sort_index()
+
+    def describe(self):
+        df = self.frame()
+        return {
+            'name': self.name,
+            'version': self.version,
+            'rows': len(df),
+            'columns': list(df.columns),
+            'start': _epoch_ms(df.index[:1])[0] if len(df) else None,
+            'end': _epoch_ms(df.index[-1:])[0] if len(df) else None,
+        }
+
+
+def _epoch_ms(index):
+    # as_unit: pandas may infer second resolution for second-precision strings
+    return index.as_unit('ms').asi8.tolist()
+
+
+def _clean(values):
+    # JSON has no NaN; send null instead
+    return [None if isinstance(v, float) and math.isnan(v) else v for v in values]
+
+
+def _parse_time(value):
+    import pandas as pd
+
+    try:
+        if value.replace('.', '', 1).isdigit():
+            return pd.to_datetime(float(value), unit='s')
+        ts = pd.Timestamp(value)
+    except ValueError as e:
+        raise QueryError(f"Bad time {value!r}: {e}")
+    # The indexes are naive UTC; an explicit zone (e.g. Influx's trailing Z) is converted to that
+    return ts.tz_convert(None) if ts.tzinfo is not None else ts
+
+
+def run_query(dataset, params):
+    """Evaluate a query (dict of single string values) against a Dataset."""
+    import pandas as pd
+
+    df = dataset.frame()
+
+    # Time range using the sorted index
+    start = _parse_time(params['start']) if params.get('start') else None
+    end = _parse_time(params['end']) if params.get('end') else None
+    lo = df.index.searchsorted(start, 'left') if start is not None else 0
+    hi = df.index.searchsorted(end, 'left') if end is not None else len(df)
+    df = df.iloc[lo:hi]
+
+    if params.get('columns'):
+        wanted = params['columns'].split(',')
+        missing = [c for c in wanted if c not in df.columns]
+        if missing:
+            raise QueryError(f"Unknown columns: {missing}")
+        df = df[wanted]
+
+    every = params.get('every')
+    if every:
+        try:
+            resampler = df.resample(every)
+        except ValueError as e:
+            raise QueryError(f"Bad interval {every!r}: {e}")
+        parts = []
+        for agg in params.get('agg', 'mean').split(','):
+            if agg.startswith('p') and agg[1:].replace('.', '', 1).isdigit():
+                q = float(agg[1:])
+                if q > 100:
+                    raise QueryError(f"Percentile out of range: {agg!r}")
+                part = resampler.quantile(q / 100)
+            elif agg in AGGREGATES:
+                part = getattr(resampler, agg)()
+            else:
+                raise QueryError(f"Unknown aggregate {agg!r}")
+            parts.append(part.add_suffix(f'_{agg}'))
+        counts = resampler.size()
+        df = pd.concat(parts, axis=1)[counts > 0]
+
+    # What offset/limit page over: samples, or buckets when resampled
+    total = len(df)
+    try:
+        offset = int(params.get('offset', 0))
+        limit = int(params['limit']) if params.get('limit') else None
+    except ValueError:
+        raise QueryError("offset and limit must be integers")
+    df = df.iloc[offset:offset + limit] if limit is not None else df.iloc[offset:]
+
+    columns = {'timestamp': _epoch_ms(df.index)}
+    for name in df.columns:
+        columns[name] = _clean(df[name].tolist())
+    return {'dataset': dataset.name, 'version': dataset.version, 'total': total,
+            'rows': len(df), 'columns': columns}
+
+
+class ResultCache(LRUCache):
+    """Small LRU of encoded responses."""
+
+    def __init__(self, size=CACHE_SIZE):
+        super().__init__(max_items=size)
+
+
+class QueryService:
+    def __init__(self, datasets=None, cache_size=CACHE_SIZE):
+        if datasets is None:
+            datasets = {name: (os.path.join(ROOT, path), column)
+                        for name, (path, column) in DATASETS.items()}
+        self.datasets = {name: Dataset(name, path, column) for name, (path, column) in datasets.items()}
+        self.cache = ResultCache(cache_size)
+
+    def handle(self, path, params):
+        """Return (status, body bytes) for a request path and its query parameters."""
+        if path == '/datasets':
+            body = [d.describe() for d in self.datasets.values() if os.path.exists(d.path)]
+            return 200, json.dumps(body).encode('utf-8')
+        if path == '/stats':
+            body = {'cache_hits': self.cache.hits, 'cache_misses': self.cache.misses}
+            return 200, json.dumps(body).encode('utf-8')
+        if path != '/query':
+            return 404, b'{"error": "not found"}'
+
+        dataset = self.datasets.get(params.get('dataset'))
+        if dataset is None:
+            return 404, json.dumps({'error': f"Unknown dataset {params.get('dataset')!r}"}).encode('utf-8')
+        try:
+            dataset.frame()  # reload first so the key carries the current version
+        except OSError as e:
+            return 404, json.dumps({'error': f"Data for {dataset.name!r} unavailable: {e}"}).encode('utf-8')
+
+        key = (dataset.name, dataset.version, tuple(sorted(params.items())))
+        body = self.cache.get(key)
+        if body is None:
+            try:
+                result = run_query(dataset, params)
+            except QueryError as e:
+                return 400, json.dumps({'error': str(e)}).encode('utf-8')
+            body = json.dumps(result, separators=(',', ':')).encode('utf-8')
+            self.cache.put(key, body)
+        return 200, body
+
+
+def make_handler(service):
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            url = urlparse(self.path)
+            params = {k: v[-1] for k, v in parse_qs(url.query).items()}
+            try:
+                status, body = service.handle(url.path, params)
+            except Exception as e:
+                # Answer instead of dropping the connection on the client
+                traceback.print_exc()
+                status, body = 500, json.dumps({'error': f"{type(e).__name__}: {e}"}).encode('utf-8')
+
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            if len(body) > 1024 and 'gzip' in self.headers.get('Accept-Encoding', ''):
+                body = gzip.compress(body, compresslevel=1)
+                self.send_header('Content-Encoding', 'gzip')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+
+def serve(port=DEFAULT_PORT, datasets=None, host='127.0.0.1'):
+    service = QueryService(datasets)
+    server = ThreadingHTTPServer((host, port), make_handler(service))
+    print(f"Query service on http://{host}:{port}/ ({', '.join(service.datasets)})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
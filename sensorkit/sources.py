@@ -0,0 +1,531 @@
+"""
+    Batched data sources for the dashboards.
+
+    The original DataSource in 6.2HD_plot/main2.py had one synchronous method
+    returning ten rows as a DataFrame. Sources here hand out up to N samples
+    at a time as NumPy arrays (Batch), can be awaited from asyncio without
+    blocking the event loop, and report how far behind the consumer is:
+
+        backlog  samples available at the source but not delivered yet
+        lag      seconds of data covered by that backlog
+        dropped  samples discarded because the consumer was too slow
+
+    When more than `maxsize` samples are waiting the source applies
+    backpressure: with overflow='block' it stops producing (the replay clock
+    pauses, the logger file is not read further, the MQTT network thread
+    waits), with overflow='drop_oldest' it keeps only the newest samples,
+    which suits a live view.
+
+    Adapters: CsvReplaySource (recorded CSVs), TailCsvSource (the growing CSV
+    written by the serial loggers), MqttSource (a topic on a broker, needs
+    paho-mqtt) and ArchiveSource (.skc files from sensorkit.codec).
+
+    Usage:
+        python -m sensorkit.sources csv 6.2HD_plot/gyroscope_data.csv --speed 50
+        python -m sensorkit.sources tail week-3/dht22_data.csv
+        python -m sensorkit.sources publish 6.2HD_plot/gyroscope_data.csv gyro --rate 200
+        python -m sensorkit.sources mqtt gyro --host localhost
+"""
+
+import argparse
+import asyncio
+import csv
+import json
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import deque
+from datetime import datetime
+
+import numpy as np
+
+from sensorkit import codec
+
+
+def _now_ns():
+    # Naive local wall clock, matching the timestamps the loggers write
+    return np.datetime64(datetime.now(), 'ns').astype(np.int64)
+
+
+class Batch:
+    """Up to N samples: int64 nanosecond timestamps and an (n, columns) float array."""
+
+    __slots__ = ('timestamps', 'values', 'columns')
+
+    def __init__(self, timestamps, values, columns):
+        self.timestamps = timestamps
+        self.values = values
+        self.columns = tuple(columns)
+
+    @classmethod
+    def empty(cls, columns):
+        return cls(np.empty(0, dtype=np.int64), np.empty((0, len(columns))), columns)
+
+    def __len__(self):
+        return len(self.timestamps)
+
+    def to_frame(self):
+        import pandas as pd
+
+        df = pd.DataFrame(self.values, columns=list(self.columns))
+        df.insert(0, 'timestamp', self.timestamps.astype('datetime64[ns]'))
+        return df
+
+
+# Abstract base class for data sources (Adapter pattern)
+class DataSource(ABC):
+    columns = ('x', 'y', 'z')
+    poll_interval = 0.01
+    # read_batch does file I/O; pull() then runs it in a worker thread
+    blocking_reads = False
+
+    def __init__(self, maxsize=10000, overflow='block'):
+        if overflow not in ('block', 'drop_oldest'):
+            raise ValueError(f"Unknown overflow policy {overflow!r}")
+        self.maxsize = maxsize
+        self.overflow = overflow
+        self.dropped = 0
+        self.delivered = 0
+
+    @abstractmethod
+    def read_batch(self, max_samples):
+        """Return up to max_samples samples that are ready now, without waiting."""
+
+    @property
+    def backlog(self):
+        return 0
+
+    @property
+    def lag(self):
+        return 0.0
+
+    async def pull(self, max_samples, timeout=None):
+        """Wait until at least one sample is ready (or timeout) and return up to max_samples."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            if self.blocking_reads:
+                batch = await asyncio.to_thread(self.read_batch, max_samples)
+            else:
+                batch = self.read_batch(max_samples)
+            if len(batch) or (deadline is not None and time.monotonic() >= deadline):
+                return batch
+            await asyncio.sleep(self.poll_interval)
+
+    async def batches(self, max_samples):
+        """Async iterator of non-empty batches."""
+        while True:
+            yield await self.pull(max_samples)
+
+    def get_data(self, last_timestamp, max_samples=1000):
+        """Synchronous DataFrame interface kept for the existing DataHandler."""
+        return self.read_batch(max_samples).to_frame()
+
+    def _delivered(self, batch):
+        self.delivered += len(batch)
+        return batch
+
+
+class SampleBuffer:
+    """Thread-safe bounded buffer between a producer thread and read_batch()."""
+
+    def __init__(self, columns, maxsize, overflow):
+        self.columns = tuple(columns)
+        self.maxsize = maxsize
+        self.overflow = overflow
+        self.dropped = 0
+        self._rows = deque()
+        self._cond = threading.Condition()
+        self._closed = False
+
+    def put(self, timestamp_ns, values):
+        with self._cond:
+            if len(self._rows) >= self.maxsize:
+                if self.overflow == 'drop_oldest':
+                    self._rows.popleft()
+                    self.dropped += 1
+                else:
+                    # Block the producer until the consumer catches up
+                    self._cond.wait_for(lambda: len(self._rows) < self.maxsize or self._closed)
+            self._rows.append((timestamp_ns, values))
+
+    def take(self, max_samples):
+        with self._cond:
+            n = min(max_samples, len(self._rows))
+            rows = [self._rows.popleft() for _ in range(n)]
+            self._cond.notify_all()
+        if not rows:
+            return Batch.empty(self.columns)
+        return Batch(np.fromiter((r[0] for r in rows), dtype=np.int64, count=n),
+                     np.array([r[1] for r in rows], dtype=float).reshape(n, len(self.columns)),
+                     self.columns)
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    def __len__(self):
+        return len(self._rows)
+
+    @property
+    def span(self):
+        with self._cond:
+            if len(self._rows) < 2:
+                return 0.0
+            return (self._rows[-1][0] - self._rows[0][0]) / 1e9
+
+
+class ReplaySource(DataSource):
+    """
+    Replays in-memory arrays at `speed` times real time (None: as fast as pulled).
+
+    With loop=True the recording repeats forever, and with rebase=True the
+    timestamps are shifted to start at the wall clock time of the first read.
+    """
+
+    def __init__(self, timestamps, values, columns, speed=1.0, loop=False, rebase=True, **kwargs):
+        super().__init__(**kwargs)
+        self.columns = tuple(columns)
+        self.speed = speed
+        self.loop = loop
+        self.rebase = rebase
+
+        ts = np.asarray(timestamps, dtype=np.int64)
+        self._values = np.asarray(values, dtype=float).reshape(len(ts), len(self.columns))
+        self._first = ts[0] if len(ts) else 0
+        self._rel = ts - self._first
+        step = int(np.median(np.diff(self._rel))) if len(ts) > 1 else 10**9
+        self._period = (self._rel[-1] if len(ts) else 0) + step
+
+        self._pos = 0               # samples delivered, counting across loops
+        self._clock = None          # replay time reached, ns from the first sample
+        self._last_wall = None
+        self._base = None
+
+    def _available(self):
+        """Number of samples whose replay time has come."""
+        if self.speed is None:
+            return self._pos + self.maxsize if self.loop else len(self._rel)
+        k, rem = divmod(self._clock, self._period) if self.loop else (0, self._clock)
+        count = k * len(self._rel) + int(np.searchsorted(self._rel, rem, 'right'))
+        return count if self.loop else min(count, len(self._rel))
+
+    def _time_of(self, index):
+        k, i = divmod(index, len(self._rel))
+        return k * self._period + self._rel[i]
+
+    def _advance_clock(self):
+        wall = time.monotonic()
+        if self._clock is None:
+            self._clock, self._last_wall = 0, wall
+            self._base = _now_ns() if self.rebase else self._first
+        elif self.speed is not None:
+            self._clock += int((wall - self._last_wall) * self.speed * 1e9)
+            self._last_wall = wall
+
+    def _refresh(self):
+        """Advance the replay clock, apply the overflow policy and return the available count."""
+        self._advance_clock()
+        available = self._available()
+        if available - self._pos > self.maxsize:
+            if self.overflow == 'drop_oldest':
+                self.dropped += available - self._pos - self.maxsize
+                self._pos = available - self.maxsize
+            elif self.speed is not None:
+                # Pause the replay clock at the last sample that still fits
+                available = self._pos + self.maxsize
+                self._clock = int(self._time_of(available - 1))
+            else:
+                available = self._pos + self.maxsize
+        return available
+
+    def read_batch(self, max_samples):
+        if not len(self._rel):
+            return Batch.empty(self.columns)
+        available = self._refresh()
+
+        end = min(available, self._pos + max_samples)
+        if end <= self._pos:
+            return Batch.empty(self.columns)
+
+        index = np.arange(self._pos, end)
+        n = len(self._rel)
+        rows = index % n
+        times = (index // n) * self._period + self._rel[rows] + self._base
+        self._pos = end
+        return self._delivered(Batch(times, self._values[rows], self.columns))
+
+    @property
+    def backlog(self):
+        if not len(self._rel):
+            return 0
+        return max(self._refresh() - self._pos, 0)
+
+    @property
+    def lag(self):
+        backlog = self.backlog
+        if not backlog:
+            return 0.0
+        return (self._time_of(self._pos + backlog - 1) - self._time_of(self._pos)) / 1e9
+
+
+class CsvReplaySource(ReplaySource):
+    """Replay a recorded CSV such as 6.2HD_plot/gyroscope_data.csv."""
+
+    def __init__(self, path, columns=None, time_column=None, skiprows=0, **kwargs):
+        import pandas as pd
+
+        df = pd.read_csv(path, skiprows=skiprows)
+        time_column = time_column or next(c for c in df.columns if 'time' in c.lower())
+        times = df.pop(time_column)
+        if pd.api.types.is_numeric_dtype(times):
+            times = pd.to_datetime(times, unit='s')
+        else:
+            times = pd.to_datetime(times, errors='coerce', format='mixed')
+        keep = times.notna().values
+        columns = list(columns or df.select_dtypes('number').columns)
+
+        super().__init__(times[keep].values.astype('datetime64[ns]').astype(np.int64),
+                         df.loc[keep, columns].to_numpy(dtype=float), columns, **kwargs)
+
+
+class ArchiveSource(ReplaySource):
+    """Replay a .skc archive written by sensorkit.codec."""
+
+    def __init__(self, path, columns=None, **kwargs):
+        with codec.ArchiveReader(path) as reader:
+            columns = list(columns or reader.columns)
+            timestamps, data = reader.read_all()
+        super().__init__(np.array(timestamps, dtype=np.int64),
+                         np.column_stack([data[c] for c in columns]), columns, **kwargs)
+
+
+class TailCsvSource(DataSource):
+    """
+    Follow a CSV that a serial logger (week-2/wk2sensor.py, week-3/main.py)
+    is still appending to. Only complete lines are consumed; with
+    overflow='block' the file simply stays unread until there is room.
+    """
+
+    blocking_reads = True
+
+    def __init__(self, path, columns=None, time_column=None, from_start=True, **kwargs):
+        super().__init__(**kwargs)
+        self.path = path
+        self.invalid = 0
+        self._wanted = columns
+        self._time_column = time_column
+        self._header = None
+        self._offset = 0
+        self._pending = None
+        self.columns = tuple(columns or ())
+        if not from_start:
+            with open(path, 'rb') as f:
+                self._read_header(f)
+                f.seek(0, 2)
+                self._offset = f.tell()
+
+    def _read_header(self, f):
+        line = f.readline()
+        if not line.endswith(b'\n'):
+            return False
+        self._header = next(csv.reader([line.decode('utf-8')]))
+        self._offset = f.tell()
+        if self._time_column is None:
+            self._time_column = next((h for h in self._header if 'time' in h.lower()), None)
+        if not self.columns:
+            self.columns = tuple(h for h in self._header if h != self._time_column)
+        self._t_idx = self._header.index(self._time_column) if self._time_column else None
+        self._v_idx = [self._header.index(c) for c in self.columns]
+        self._pending = SampleBuffer(self.columns, self.maxsize, 'drop_oldest')
+        return True
+
+    def _read_lines(self):
+        # Read at most maxsize lines at a time so a long unread stretch never
+        # sits in memory; with drop_oldest keep going and let the buffer drop
+        with open(self.path, 'rb') as f:
+            f.seek(self._offset)
+            while True:
+                room = self.maxsize - len(self._pending) if self.overflow == 'block' else self.maxsize
+                rows = []
+                while len(rows) < room:
+                    line = f.readline()
+                    if not line.endswith(b'\n'):
+                        break  # nothing more, or a line the logger is still writing
+                    self._offset = f.tell()
+                    rows.append(line.decode('utf-8', 'replace'))
+                self._parse(rows)
+                if self.overflow == 'block' or len(rows) < room:
+                    break
+        self.dropped = self._pending.dropped
+
+    def _parse(self, rows):
+        for row in csv.reader(rows):
+            try:
+                ts = codec.parse_timestamp(row[self._t_idx])[0] if self._t_idx is not None else _now_ns()
+                values = tuple(float(row[i]) for i in self._v_idx)
+            except (ValueError, IndexError):
+                self.invalid += 1
+                continue
+            self._pending.put(ts, values)
+
+    def read_batch(self, max_samples):
+        if self._header is None:
+            with open(self.path, 'rb') as f:
+                f.seek(self._offset)
+                if not self._read_header(f):
+                    return Batch.empty(self.columns)
+        self._read_lines()
+        return self._delivered(self._pending.take(max_samples))
+
+    @property
+    def backlog(self):
+        return len(self._pending) if self._pending is not None else 0
+
+    @property
+    def lag(self):
+        return self._pending.span if self._pending is not None else 0.0
+
+
+def parse_message(payload, columns):
+    """
+    Decode an MQTT payload into [(timestamp_ns, values), ...].
+
+    Accepts a JSON object ({"timestamp": ..., "x": ..}), a JSON list of
+    such objects, or a CSV line "timestamp,x,y,z" / "x,y,z".
+    """
+    text = payload.decode('utf-8').strip()
+    if text.startswith('{') or text.startswith('['):
+        items = json.loads(text)
+        rows = []
+        for item in items if isinstance(items, list) else [items]:
+            ts = item.get('timestamp')
+            ts = codec.parse_timestamp(str(ts))[0] if ts is not None else _now_ns()
+            rows.append((ts, tuple(float(item[c]) for c in columns)))
+        return rows
+    parts = text.split(',')
+    if len(parts) == len(columns) + 1:
+        return [(codec.parse_timestamp(parts[0])[0], tuple(float(p) for p in parts[1:]))]
+    return [(_now_ns(), tuple(float(p) for p in parts))]
+
+
+class MqttSource(DataSource):
+    """
+    Subscribe to an MQTT topic (needs paho-mqtt). With overflow='block' the
+    paho network thread waits while the buffer is full, so the broker sees
+    the subscriber slow down instead of samples piling up in memory.
+    """
+
+    def __init__(self, topic, host='localhost', port=1883, columns=('x', 'y', 'z'), qos=0, **kwargs):
+        import paho.mqtt.client as mqtt
+
+        super().__init__(**kwargs)
+        self.columns = tuple(columns)
+        self.topic = topic
+        self.invalid = 0
+        self._buffer = SampleBuffer(self.columns, self.maxsize, self.overflow)
+
+        if hasattr(mqtt, 'CallbackAPIVersion'):
+            self._client = mqtt.Client(mqtt.CallbackAPIVersion.VERSION2)
+        else:
+            self._client = mqtt.Client()
+        self._client.on_connect = lambda client, *args: client.subscribe(topic, qos)
+        self._client.on_message = self._on_message
+        self._client.connect(host, port)
+        self._client.loop_start()
+
+    def _on_message(self, client, userdata, message):
+        try:
+            rows = parse_message(message.payload, self.columns)
+        except (ValueError, KeyError, TypeError):
+            self.invalid += 1
+            return
+        for ts, values in rows:
+            self._buffer.put(ts, values)
+
+    def read_batch(self, max_samples):
+        batch = self._buffer.take(max_samples)
+        self.dropped = self._buffer.dropped
+        return self._delivered(batch)
+
+    @property
+    def backlog(self):
+        return len(self._buffer)
+
+    @property
+    def lag(self):
+        return self._buffer.span
+
+    def close(self):
+        self._buffer.close()
+        self._client.loop_stop()
+        self._client.disconnect()
+
+
+def publish_csv(path, topic, host='localhost', port=1883, rate=100.0, batch=1):
+    """Publish the rows of a CSV to a topic as JSON, for testing MqttSource."""
+    import paho.mqtt.publish as publish
+
+    source = CsvReplaySource(path, speed=None)
+    interval = batch / rate if rate else 0
+    while True:
+        chunk = source.read_batch(batch)
+        if not len(chunk):
+            break
+        messages = [{'timestamp': codec.format_timestamp(int(t), 'iso', 6),
+                     **dict(zip(chunk.columns, map(float, row)))}
+                    for t, row in zip(chunk.timestamps, chunk.values)]
+        publish.single(topic, json.dumps(messages if batch > 1 else messages[0]), hostname=host, port=port)
+        if interval:
+            time.sleep(interval)
+
+
+async def _monitor(source, batch_size, seconds):
+    start = time.monotonic()
+    next_report = start + 1
+    async for batch in source.batches(batch_size):
+        now = time.monotonic()
+        if now >= next_report:
+            print(f"delivered={source.delivered} backlog={source.backlog} "
+                  f"lag={source.lag:.2f}s dropped={source.dropped}")
+            next_report = now + 1
+        if seconds and now - start >= seconds:
+            break
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Inspect a batched data source')
+    parser.add_argument('kind', choices=['csv', 'archive', 'tail', 'mqtt', 'publish'])
+    parser.add_argument('target', help='file path, or topic for mqtt')
+    parser.add_argument('topic', nargs='?', help='topic to publish to (publish only)')
+    parser.add_argument('--speed', type=float, default=1.0, help='replay speed (csv/archive)')
+    parser.add_argument('--batch', type=int, default=500)
+    parser.add_argument('--maxsize', type=int, default=10000)
+    parser.add_argument('--overflow', choices=['block', 'drop_oldest'], default='block')
+    parser.add_argument('--host', default='localhost')
+    parser.add_argument('--port', type=int, default=1883)
+    parser.add_argument('--rate', type=float, default=100.0, help='messages per second (publish)')
+    parser.add_argument('--seconds', type=float, default=0, help='stop after this long')
+    args = parser.parse_args()
+
+    if args.kind == 'publish':
+        publish_csv(args.target, args.topic, args.host, args.port, args.rate)
+        return
+
+    options = {'maxsize': args.maxsize, 'overflow': args.overflow}
+    if args.kind == 'csv':
+        source = CsvReplaySource(args.target, speed=args.speed, **options)
+    elif args.kind == 'archive':
+        source = ArchiveSource(args.target, speed=args.speed, **options)
+    elif args.kind == 'tail':
+        source = TailCsvSource(args.target, **options)
+    else:
+        source = MqttSource(args.target, args.host, args.port, **options)
+    try:
+        asyncio.run(_monitor(source, args.batch, args.seconds))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,183 @@
+"""
+    Sliding-window spectral analysis for the gyroscope and accelerometer data.
+
+    Windows are taken as strided views of the sample array
+    (sliding_window_view), so a whole spectrogram is one taper multiply and
+    one rfft over a 2-D (or 3-D for several axes) view, with no Python loop
+    per window. StreamingSpectrogram keeps the last few samples between
+    calls and only transforms the windows completed by newly arrived data.
+
+    The recorded data is not sampled on an exact grid (the gyroscope logger
+    drifts between ~0.3 s and ~0.8 s), so resample_uniform() is provided to
+    put it on one before transforming.
+"""
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+# Default bands in Hz for band_powers(); the loggers sample at 1-10 Hz so
+# everything above a few Hz is just the top of the spectrum.
+DEFAULT_BANDS = {
+    'low': (0.0, 0.5),
+    'mid': (0.5, 2.0),
+    'high': (2.0, np.inf),
+}
+
+
+def estimate_rate(timestamps):
+    """Sample rate in Hz from the median spacing of timestamps (seconds or datetime64)."""
+    t = np.asarray(timestamps)
+    if np.issubdtype(t.dtype, np.datetime64):
+        t = t.astype('datetime64[ns]').astype(np.int64) / 1e9
+    dt = np.median(np.diff(t))
+    return 1.0 / dt if dt > 0 else 1.0
+
+
+def resample_uniform(timestamps, values, fs):
+    """
+    Linearly interpolate irregular samples onto a grid of rate fs.
+
+    Returns (grid, resampled) where grid is in seconds from the first
+    timestamp. values may be 1-D or (n, channels).
+    """
+    t = np.asarray(timestamps)
+    if np.issubdtype(t.dtype, np.datetime64):
+        t = t.astype('datetime64[ns]').astype(np.int64) / 1e9
+    t = t - t[0]
+    grid = np.arange(0.0, t[-1] + 0.5 / fs, 1.0 / fs)
+    values = np.asarray(values, dtype=float)
+    if values.ndim == 1:
+        return grid, np.interp(grid, t, values)
+    return grid, np.column_stack([np.interp(grid, t, values[:, i]) for i in range(values.shape[1])])
+
+
+def sliding_windows(x, window, hop):
+    """(frames, [channels,] window) strided view over axis 0 of x; no data is copied."""
+    x = np.asarray(x)
+    if len(x) < window:
+        return np.empty((0,) + x.shape[1:] + (window,), dtype=x.dtype)
+    return sliding_window_view(x, window, axis=0)[::hop]
+
+
+def _taper(window, kind):
+    if kind == 'hann':
+        return np.hanning(window)
+    if kind == 'hamming':
+        return np.hamming(window)
+    return np.ones(window)
+
+
+def _frames_power(frames, fs, taper):
+    # Demean each window so the DC bin does not swamp the plot, then scale
+    # to a one-sided power spectral density.
+    frames = frames - frames.mean(axis=-1, keepdims=True)
+    spectrum = np.fft.rfft(frames * taper, axis=-1)
+    power = (spectrum.real ** 2 + spectrum.imag ** 2) / (fs * (taper ** 2).sum())
+    if taper.size % 2 == 0:
+        power[..., 1:-1] *= 2
+    else:
+        power[..., 1:] *= 2
+    return power
+
+
+def stft(x, fs, window=64, hop=16, taper='hann'):
+    """
+    Short-time Fourier transform of x along axis 0.
+
+    Returns (freqs, times, spectrum) where times are window centres in
+    seconds and spectrum has shape (frames, [channels,] freqs).
+    """
+    frames = sliding_windows(np.asarray(x, dtype=float), window, hop)
+    w = _taper(window, taper)
+    spectrum = np.fft.rfft(frames * w, axis=-1)
+    freqs = np.fft.rfftfreq(window, 1.0 / fs)
+    times = (np.arange(frames.shape[0]) * hop + window / 2) / fs
+    return freqs, times, spectrum
+
+
+def spectrogram(x, fs, window=64, hop=16, taper='hann'):
+    """Power spectral density per window; same shapes as stft()."""
+    frames = sliding_windows(np.asarray(x, dtype=float), window, hop)
+    power = _frames_power(frames, fs, _taper(window, taper))
+    freqs = np.fft.rfftfreq(window, 1.0 / fs)
+    times = (np.arange(frames.shape[0]) * hop + window / 2) / fs
+    return freqs, times, power
+
+
+def band_powers(freqs, power, bands=None):
+    """Integrate power over each (low, high) band; returns {name: array per frame}."""
+    bands = DEFAULT_BANDS if bands is None else bands
+    df = freqs[1] - freqs[0] if len(freqs) > 1 else 1.0
+    return {
+        name: power[..., (freqs >= lo) & (freqs < hi)].sum(axis=-1) * df
+        for name, (lo, hi) in bands.items()
+    }
+
+
+class StreamingSpectrogram:
+    """
+    Incremental spectrogram over a live stream of samples.
+
+    update() accepts any number of new samples and returns only the frames
+    they complete. The last max_frames frames are kept in a ring buffer so a
+    dashboard can redraw the recent history without recomputing it.
+    """
+
+    def __init__(self, fs, window=64, hop=16, channels=None, taper='hann', max_frames=512):
+        self.fs = fs
+        self.window = window
+        self.hop = hop
+        self.taper = _taper(window, taper)
+        self.freqs = np.fft.rfftfreq(window, 1.0 / fs)
+        self.max_frames = max_frames
+
+        tail_shape = () if channels is None else (channels,)
+        self._pending = np.empty((0,) + tail_shape)
+        self._consumed = 0          # samples dropped from the front of _pending
+        self._frame_count = 0       # frames produced so far
+        self._history = np.zeros((max_frames,) + tail_shape + (len(self.freqs),))
+        self._times = np.zeros(max_frames)
+
+    def update(self, samples):
+        """Append samples and return (times, power) for the newly completed windows."""
+        samples = np.asarray(samples, dtype=float)
+        if samples.ndim == 1 and self._pending.ndim == 2:
+            samples = samples[np.newaxis, :]
+        self._pending = np.concatenate([self._pending, samples])
+
+        frames = sliding_windows(self._pending, self.window, self.hop)
+        n = frames.shape[0]
+        if n == 0:
+            return np.empty(0), np.empty((0,) + self._history.shape[1:])
+
+        power = _frames_power(frames, self.fs, self.taper)
+        starts = self._consumed + np.arange(n) * self.hop
+        times = (starts + self.window / 2) / self.fs
+
+        # Keep only what the next window still needs
+        drop = n * self.hop
+        self._pending = self._pending[drop:]
+        self._consumed += drop
+
+        self._store(times, power)
+        return times, power
+
+    def _store(self, times, power):
+        total = len(times)
+        if total > self.max_frames:
+            times, power = times[-self.max_frames:], power[-self.max_frames:]
+        base = self._frame_count + total - len(times)
+        idx = (base + np.arange(len(times))) % self.max_frames
+        self._history[idx] = power
+        self._times[idx] = times
+        self._frame_count += total
+
+    def history(self):
+        """(freqs, times, power) for the retained frames, oldest first."""
+        count = min(self._frame_count, self.max_frames)
+        order = (self._frame_count - count + np.arange(count)) % self.max_frames
+        return self.freqs, self._times[order], self._history[order]
+
+    def band_powers(self, bands=None):
+        freqs, times, power = self.history()
+        return times, band_powers(freqs, power, bands)
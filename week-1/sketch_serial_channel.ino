@@ -0,0 +1,36 @@
+/*
+    Responder for sensorkit/channel.py.
+
+    Each request is one line "<seq> <number>". The reply echoes the
+    sequence number so the Python side can have several requests in
+    flight and still match every reply: "<seq> <number + 1>".
+*/
+
+String line;
+
+void setup() {
+  Serial.begin(9600);  // set baud rate
+  line.reserve(32);
+}
+
+void loop() {
+  // Collect characters without blocking until a full line has arrived
+  while (Serial.available() > 0) {
+    char c = Serial.read();
+    if (c != '\n') {
+      line += c;
+      continue;
+    }
+
+    int space = line.indexOf(' ');
+    if (space > 0) {
+      String seq = line.substring(0, space);
+      long x = line.substring(space + 1).toInt();
+
+      Serial.print(seq);
+      Serial.print(' ');
+      Serial.println(x + 1);
+    }
+    line = "";
+  }
+}
@@ -1,42 +1,62 @@
 import serial
 import csv
 import time
+import os
+import sys
+
+# Make the shared sensorkit package importable when run from this folder
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from sensorkit import metrics
+
+metrics.describe('serial_lines_total', 'Non-empty lines read from the serial port')
+metrics.describe('serial_lines_dropped_total', 'Serial lines that could not be parsed')
+metrics.describe('csv_rows_written_total', 'Rows written to the CSV log')
 
 # Set up the serial connection
 arduino_port = '/dev/tty.usbmodem1301'  # Change this to match your Arduino's port
 baud_rate = 9600
-ser = serial.Serial(arduino_port, baud_rate)
 
-# Open a CSV file to write the data
+# CSV file to write the data to
 csv_file = 'ultrasonic_data.csv'
-with open(csv_file, 'w', newline='') as file:
-    writer = csv.writer(file)
-    writer.writerow(['Timestamp', 'Distance (cm)'])
-
-    try:
-        while True:
-            # Read data from Arduino
-            data = ser.readline().decode('utf-8').strip()
-            
-            # Check if the data is valid
-            if data:
-                try:
-                    distance = float(data)
-                    timestamp = time.time()
-                    
-                    # Write data to CSV
-                    writer.writerow([timestamp, distance])
-                    print(f"Timestamp: {timestamp}, Distance: {distance} cm")
-                    
-                except ValueError:
-                    print(f"Invalid data received: {data}")
-            
-            time.sleep(0.1)  # Adjust delay as needed
-            
-    except KeyboardInterrupt:
-        print("Data collection stopped.")
-
-    finally:
-        ser.close()
-        print(f"Data saved to {csv_file}")
 
+def main():
+    metrics.serve_from_env()
+    ser = serial.Serial(arduino_port, baud_rate)
+
+    # Open a CSV file to write the data
+    with open(csv_file, 'w', newline='') as file:
+        writer = csv.writer(file)
+        writer.writerow(['Timestamp', 'Distance (cm)'])
+
+        try:
+            while True:
+                # Read data from Arduino
+                data = ser.readline().decode('utf-8').strip()
+
+                # Check if the data is valid
+                if data:
+                    metrics.inc('serial_lines_total', sensor='ultrasonic')
+                    try:
+                        distance = float(data)
+                        timestamp = time.time()
+
+                        # Write data to CSV
+                        writer.writerow([timestamp, distance])
+                        print(f"Timestamp: {timestamp}, Distance: {distance} cm")
+                        metrics.inc('csv_rows_written_total', sensor='ultrasonic')
+
+                    except ValueError:
+                        metrics.inc('serial_lines_dropped_total', sensor='ultrasonic')
+                        print(f"Invalid data received: {data}")
+
+                time.sleep(0.1)  # Adjust delay as needed
+
+        except KeyboardInterrupt:
+            print("Data collection stopped.")
+
+        finally:
+            ser.close()
+            print(f"Data saved to {csv_file}")
+
+if __name__ == "__main__":
+    main()
@@ -3,6 +3,16 @@ import serial
 import csv
 from datetime import datetime
 import time
+import os
+import sys
+
+# Make the shared sensorkit package importable when run from this folder
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from sensorkit import metrics
+
+metrics.describe('serial_lines_total', 'Non-empty lines read from the serial port')
+metrics.describe('serial_lines_dropped_total', 'Serial lines that could not be parsed')
+metrics.describe('csv_rows_written_total', 'Rows written to the CSV log')
 
 # Configure the serial port
 SERIAL_PORT = '/dev/cu.usbmodem1201' 
@@ -27,6 +37,7 @@ def parse_data(line):
     return None
 
 def main():
+    metrics.serve_from_env()
     try:
         with serial.Serial(SERIAL_PORT, BAUD_RATE, timeout=TIMEOUT) as ser, \
              open(CSV_FILE, 'w', newline='') as csvfile:
@@ -39,13 +50,17 @@ def main():
             while True:
                 line = read_serial_data(ser)
                 if line:
+                    metrics.inc('serial_lines_total', sensor='dht22')
                     data = parse_data(line)
+                    if data is None:
+                        metrics.inc('serial_lines_dropped_total', sensor='dht22')
                     if data:
                         humidity, temperature = data
                         timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
                         csv_writer.writerow([timestamp, humidity, temperature])
                         print(f"{timestamp}: Humidity: {humidity}%, Temperature: {temperature}°C")
                         csvfile.flush()  # Ensure data is written to file immediately
+                        metrics.inc('csv_rows_written_total', sensor='dht22')
                 
                 time.sleep(0.1)  # Small delay to prevent excessive CPU usage
                 
@@ -5,17 +5,13 @@ from sklearn.linear_model import LinearRegression
 from sklearn.preprocessing import PolynomialFeatures
 import os
 
-# Create an output directory if it doesn't exist
+# Output directory for the plots
 output_dir = 'analysis_output'
-os.makedirs(output_dir, exist_ok=True)
 
 # Function to print analysis results
 def print_analysis(text):
     print(text)
 
-# Step 1: Load the data
-df = pd.read_csv('dht22_data.csv', parse_dates=['Timestamp'])
-
 # Function to perform analysis
 def analyze_data(df, title, plot_filename, degree=1):
     if len(df) == 0:
@@ -61,42 +57,52 @@ def analyze_data(df, title, plot_filename, degree=1):
 
     return model, analysis
 
-# Initial analysis
-initial_model, initial_analysis = analyze_data(df, "Initial Temperature vs Humidity", "initial_plot.png", degree=2)
-print_analysis(initial_analysis)
-
-# Step 6: Filter outliers based on humidity
-q_low = df["Humidity (%)"].quantile(0.05)
-q_high = df["Humidity (%)"].quantile(0.95)
-df_filtered = df[(df["Humidity (%)"] > q_low) & (df["Humidity (%)"] < q_high)]
-
-# Step 7: Repeat analysis with filtered data
-filtered_model, filtered_analysis = analyze_data(df_filtered, "Filtered Temperature vs Humidity", "filtered_plot.png", degree=2)
-print_analysis(filtered_analysis)
-
-comparison = "\nComparison of scenarios:\n"
-comparison += f"Initial data points: {len(df)}\n"
-comparison += f"Filtered data points: {len(df_filtered)}\n"
-comparison += "The filtering process removed some extreme humidity values.\n"
-comparison += "This results in a trend line that better represents the majority of the data points.\n"
-print_analysis(comparison)
-
-# Step 8: Further filter outliers
-q_low = df_filtered["Humidity (%)"].quantile(0.10)
-q_high = df_filtered["Humidity (%)"].quantile(0.90)
-df_more_filtered = df_filtered[(df_filtered["Humidity (%)"] > q_low) & (df_filtered["Humidity (%)"] < q_high)]
-
-# Repeat analysis with more filtered data
-more_filtered_model, more_filtered_analysis = analyze_data(df_more_filtered, "More Filtered Temperature vs Humidity", "more_filtered_plot.png", degree=2)
-print_analysis(more_filtered_analysis)
-
-final_comparison = "\nComparison after further filtering:\n"
-final_comparison += f"Initial data points: {len(df)}\n"
-final_comparison += f"First filtered data points: {len(df_filtered)}\n"
-final_comparison += f"More filtered data points: {len(df_more_filtered)}\n"
-final_comparison += "The second round of filtering further refined the dataset.\n"
-final_comparison += "This results in a trend line that represents the core relationship between temperature and humidity,\n"
-final_comparison += "excluding more of the extreme variations.\n"
-print_analysis(final_comparison)
-
-print("\nAnalysis complete. PNG plots have been saved in the 'analysis_output' directory.")
\ No newline at end of file
+def main(file_path='dht22_data.csv'):
+    # Create an output directory if it doesn't exist
+    os.makedirs(output_dir, exist_ok=True)
+
+    # Step 1: Load the data
+    df = pd.read_csv(file_path, parse_dates=['Timestamp'])
+
+    # Initial analysis
+    initial_model, initial_analysis = analyze_data(df, "Initial Temperature vs Humidity", "initial_plot.png", degree=2)
+    print_analysis(initial_analysis)
+
+    # Step 6: Filter outliers based on humidity
+    q_low = df["Humidity (%)"].quantile(0.05)
+    q_high = df["Humidity (%)"].quantile(0.95)
+    df_filtered = df[(df["Humidity (%)"] > q_low) & (df["Humidity (%)"] < q_high)]
+
+    # Step 7: Repeat analysis with filtered data
+    filtered_model, filtered_analysis = analyze_data(df_filtered, "Filtered Temperature vs Humidity", "filtered_plot.png", degree=2)
+    print_analysis(filtered_analysis)
+
+    comparison = "\nComparison of scenarios:\n"
+    comparison += f"Initial data points: {len(df)}\n"
+    comparison += f"Filtered data points: {len(df_filtered)}\n"
+    comparison += "The filtering process removed some extreme humidity values.\n"
+    comparison += "This results in a trend line that better represents the majority of the data points.\n"
+    print_analysis(comparison)
+
+    # Step 8: Further filter outliers
+    q_low = df_filtered["Humidity (%)"].quantile(0.10)
+    q_high = df_filtered["Humidity (%)"].quantile(0.90)
+    df_more_filtered = df_filtered[(df_filtered["Humidity (%)"] > q_low) & (df_filtered["Humidity (%)"] < q_high)]
+
+    # Repeat analysis with more filtered data
+    more_filtered_model, more_filtered_analysis = analyze_data(df_more_filtered, "More Filtered Temperature vs Humidity", "more_filtered_plot.png", degree=2)
+    print_analysis(more_filtered_analysis)
+
+    final_comparison = "\nComparison after further filtering:\n"
+    final_comparison += f"Initial data points: {len(df)}\n"
+    final_comparison += f"First filtered data points: {len(df_filtered)}\n"
+    final_comparison += f"More filtered data points: {len(df_more_filtered)}\n"
+    final_comparison += "The second round of filtering further refined the dataset.\n"
+    final_comparison += "This results in a trend line that represents the core relationship between temperature and humidity,\n"
+    final_comparison += "excluding more of the extreme variations.\n"
+    print_analysis(final_comparison)
+
+    print("\nAnalysis complete. PNG plots have been saved in the 'analysis_output' directory.")
+
+if __name__ == "__main__":
+    main()